@@ -9,27 +9,44 @@ This file is kept for backward compatibility only.
 """
 
 import os
+import re
+import shutil
 import sys
-import subprocess
-import time
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Optional, Tuple
+from typing import Mapping, Optional, Tuple
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import HTTPError as Urllib3HTTPError
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
 import openpyxl
 
 # Configuration
 BASE_URL = "https://www.canararobeco.com/documents/statutory-disclosures/scheme-dashboard/scheme-monthly-portfolio/"
 FUND_NAME_PATTERN = "Canara Robeco Large and Mid Cap Fund"
+FUND_NAME_PATTERN_LOWER = FUND_NAME_PATTERN.lower()
 DOWNLOAD_DIR = Path(__file__).parent.parent / "excel-data" / "canara-robeco"
 LOG_DIR = Path(__file__).parent.parent / "logs"
+# Key prefix in base_downloader's download URL / validator store; matches
+# downloaders/canara_robeco.py so both entry points share one cache entry
+FUND_KEY = "canara_robeco"
 MAX_PAGINATION = 10
+PAGINATION_WORKERS = 4  # concurrent page fetches (kept low to be polite)
 MAX_RETRIES = 3
 RETRY_DELAY = 5  # seconds
 MIN_FILE_SIZE = 50 * 1024  # 50 KB
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024  # 1 MB copy buffer
 MIN_HOLDINGS = 50
+ANCHOR_STRAINER = SoupStrainer(['a', 'button'])
+# Current fund name or its old name, matched against a lowercased title row
+FUND_NAME_RE = re.compile(r'large.*mid|emerging.*equities')
+MONTH_NAMES = (
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December",
+)
 
 # Setup logging
 LOG_DIR.mkdir(exist_ok=True)
@@ -44,6 +61,11 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Sibling scripts (extract_all_funds, downloaders/) are imported in-process
+sys.path.insert(0, str(Path(__file__).parent))
+
+from downloaders.base_downloader import check_cached_url, load_etag_entry, save_etag_entry
+
 
 def get_target_month() -> Tuple[int, int]:
     """
@@ -53,26 +75,14 @@ def get_target_month() -> Tuple[int, int]:
     Returns:
         Tuple of (year, month)
     """
-    today = datetime.now()
-    
-    # Get previous month
-    if today.month == 1:
-        target_year = today.year - 1
-        target_month = 12
-    else:
-        target_year = today.year
-        target_month = today.month - 1
-    
-    return target_year, target_month
+    # Last day of the previous month
+    prev = datetime.now().replace(day=1) - timedelta(days=1)
+    return prev.year, prev.month
 
 
 def get_output_filename(year: int, month: int) -> Path:
     """Generate output filename for downloaded file."""
-    month_names = [
-        "January", "February", "March", "April", "May", "June",
-        "July", "August", "September", "October", "November", "December"
-    ]
-    month_name = month_names[month - 1]
+    month_name = MONTH_NAMES[month - 1]
     filename = f"EQ-–-Canara-Robeco-Large-and-Mid-Cap-Fund-–-{month_name}-{year}.xlsx"
     return DOWNLOAD_DIR / filename
 
@@ -101,9 +111,32 @@ def create_session() -> requests.Session:
         'Sec-Fetch-Site': 'none',
         'Cache-Control': 'max-age=0'
     })
+    
+    # One pooled keep-alive connection per worker, shared by the pagination
+    # scan and the download; urllib3 handles retries on the pooled sockets
+    adapter = HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=PAGINATION_WORKERS,
+        max_retries=Retry(
+            total=MAX_RETRIES,
+            backoff_factor=RETRY_DELAY,
+            status_forcelist=[500, 502, 503, 504],
+        ),
+    )
+    session.mount('https://', adapter)
     return session
 
 
+def is_target_fund(combined: str) -> bool:
+    """
+    Check lowercased link text + href for the Large and Mid Cap fund.
+    The fund was previously named "Emerging Equities", so accept that too.
+    """
+    if 'canara' in combined and 'robeco' in combined and 'large' in combined and 'mid' in combined:
+        return True
+    return 'emerging' in combined and 'equities' in combined
+
+
 def find_download_link(session: requests.Session, year: int, month: int, pagination: int) -> Optional[str]:
     """
     Search for the download link on a specific pagination page.
@@ -126,7 +159,8 @@ def find_download_link(session: requests.Session, year: int, month: int, paginat
         
         logger.info(f"  [OK] Page loaded successfully (status: {response.status_code}, size: {len(response.content)} bytes)")
         
-        soup = BeautifulSoup(response.content, 'html.parser')
+        # Only links and download buttons are inspected, so skip building the rest of the tree
+        soup = BeautifulSoup(response.content, 'lxml', parse_only=ANCHOR_STRAINER)
         
         # Look for links containing the fund name
         # Common patterns: <a href="...xlsx">Fund Name</a> or data-download attributes
@@ -134,41 +168,36 @@ def find_download_link(session: requests.Session, year: int, month: int, paginat
         
         logger.info(f"  Found {len(links)} total links on page {pagination}")
         
-        # Log all Excel/XLS links found
-        excel_links = [link for link in links if link.get('href', '').endswith(('.xlsx', '.xls'))]
-        logger.info(f"  Found {len(excel_links)} Excel file links")
-        
-        # Log fund-related links
-        fund_related = []
+        # Lowercase each link's text + href once for all the checks below
+        link_info = []
         for link in links:
             href = link.get('href', '')
             text = link.get_text(strip=True)
-            
-            # Log only links that look like our target fund (or old name)
-            combined = (text + ' ' + href).lower()
-            is_canara = 'canara' in combined and 'robeco' in combined
-            is_target = (
-                is_canara and 'large' in combined and ('mid' in combined or 'midcap' in combined)
-            ) or (
-                'emerging' in combined and 'equities' in combined
-            )
-            if is_target:
-                fund_related.append(f"    - Text: '{text[:60]}...' | Href: {href[:80]}...")
+            link_info.append((link, href, text, (text + ' ' + href).lower()))
         
-        if fund_related:
-            logger.info(f"  Found {len(fund_related)} fund-related links:")
-            for item in fund_related[:10]:  # Log first 10
-                logger.info(item)
-        else:
-            logger.info("  No fund-related links found on this page")
-        
-        for link in links:
-            href = link.get('href', '')
-            text = link.get_text(strip=True)
+        # Diagnostics only: skip the extra scans unless debug logging is on
+        if logger.isEnabledFor(logging.DEBUG):
+            excel_count = sum(1 for _, href, _, _ in link_info if href.endswith(('.xlsx', '.xls')))
+            logger.debug(f"  Found {excel_count} Excel file links")
             
+            # Log fund-related links (target fund or its old name)
+            fund_related = [
+                f"    - Text: '{text[:60]}...' | Href: {href[:80]}..."
+                for _, href, text, combined in link_info
+                if is_target_fund(combined)
+            ]
+            
+            if fund_related:
+                logger.debug(f"  Found {len(fund_related)} fund-related links:")
+                for item in fund_related[:10]:  # Log first 10
+                    logger.debug(item)
+            else:
+                logger.debug("  No fund-related links found on this page")
+        
+        for _, href, text, combined in link_info:
             # Check if this link is for our fund
-            if FUND_NAME_PATTERN.lower() in text.lower() or FUND_NAME_PATTERN.lower() in href.lower():
-                if href.endswith('.xlsx') or href.endswith('.xls'):
+            if FUND_NAME_PATTERN_LOWER in combined:
+                if href.endswith(('.xlsx', '.xls')):
                     # Make absolute URL if relative
                     if href.startswith('http'):
                         download_url = href
@@ -183,21 +212,12 @@ def find_download_link(session: requests.Session, year: int, month: int, paginat
         # Try relaxed search: "large" AND "mid" OR "emerging equities"
         # Note: Fund was renamed from "Emerging Equities" to "Large and Mid Cap Fund"
         logger.info("  Trying relaxed search: 'large' AND 'mid' OR 'emerging equities'")
-        for link in excel_links:
-            text = link.get_text(strip=True).lower()
-            href = link.get('href', '').lower()
-            combined = text + ' ' + href
+        for link, href_actual, text, combined in link_info:
+            if not href_actual.endswith(('.xlsx', '.xls')):
+                continue
             
             # Match only the Large and Mid Cap fund (or old Emerging Equities)
-            is_match = False
-            has_canara = 'canara' in combined and 'robeco' in combined
-            if has_canara and 'large' in combined and ('mid' in combined or 'midcap' in combined):
-                is_match = True
-            elif 'emerging' in combined and 'equities' in combined:
-                is_match = True
-            
-            if is_match:
-                href_actual = link.get('href', '')
+            if is_target_fund(combined):
                 if href_actual.startswith('http'):
                     download_url = href_actual
                 elif href_actual.startswith('/'):
@@ -206,7 +226,7 @@ def find_download_link(session: requests.Session, year: int, month: int, paginat
                     download_url = f"https://www.canararobeco.com/{href_actual}"
                 
                 logger.info(f"  [MATCH] Found via relaxed search: {download_url}")
-                logger.info(f"         Link text: '{link.get_text(strip=True)[:100]}'")
+                logger.info(f"         Link text: '{text[:100]}'")
                 return download_url
         
         # Also check for download buttons with data attributes
@@ -214,7 +234,7 @@ def find_download_link(session: requests.Session, year: int, month: int, paginat
         if download_buttons:
             logger.info(f"  Found {len(download_buttons)} download buttons")
             for button in download_buttons:
-                if FUND_NAME_PATTERN.lower() in str(button).lower():
+                if FUND_NAME_PATTERN_LOWER in str(button).lower():
                     download_url = button.get('data-download') or button.get('href')
                     if download_url:
                         logger.info(f"  [MATCH] Found via button: {download_url}")
@@ -228,9 +248,9 @@ def find_download_link(session: requests.Session, year: int, month: int, paginat
         return None
 
 
-def download_file(session: requests.Session, url: str, output_path: Path) -> bool:
+def download_file(session: requests.Session, url: str, output_path: Path) -> Optional[Mapping[str, str]]:
     """
-    Download file from URL with retry logic.
+    Download file from URL. Retries are handled by the session's adapter.
     
     Args:
         session: Requests session
@@ -238,49 +258,45 @@ def download_file(session: requests.Session, url: str, output_path: Path) -> boo
         output_path: Where to save the file
         
     Returns:
-        True if successful, False otherwise
+        Response headers if successful (used for the URL cache), None otherwise
     """
-    for attempt in range(1, MAX_RETRIES + 1):
-        try:
-            logger.info(f"Downloading (attempt {attempt}/{MAX_RETRIES}): {url}")
-            
-            response = session.get(url, timeout=60, stream=True)
-            response.raise_for_status()
-            
-            # Check content type
-            content_type = response.headers.get('Content-Type', '')
-            if 'excel' not in content_type.lower() and 'spreadsheet' not in content_type.lower():
-                logger.warning(f"Unexpected content type: {content_type}")
-            
-            # Download to temporary file first
-            temp_path = output_path.with_suffix('.tmp')
-            
-            with open(temp_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-            
-            # Check file size
-            file_size = temp_path.stat().st_size
-            if file_size < MIN_FILE_SIZE:
-                logger.error(f"Downloaded file too small: {file_size} bytes")
-                temp_path.unlink()
-                return False
-            
-            logger.info(f"Downloaded {file_size:,} bytes")
-            
-            # Replace any existing file (force overwrites stale/wrong downloads)
-            os.replace(temp_path, output_path)
-            return True
-            
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Download attempt {attempt} failed: {e}")
-            if attempt < MAX_RETRIES:
-                time.sleep(RETRY_DELAY * attempt)
-            else:
-                return False
-    
-    return False
+    temp_path = output_path.with_suffix('.tmp')
+    try:
+        logger.info(f"Downloading: {url}")
+        
+        response = session.get(url, timeout=60, stream=True)
+        response.raise_for_status()
+        
+        # Check content type
+        content_type = response.headers.get('Content-Type', '')
+        if 'excel' not in content_type.lower() and 'spreadsheet' not in content_type.lower():
+            logger.warning(f"Unexpected content type: {content_type}")
+        
+        # Download to temporary file first
+        # Copy the body in 1 MB blocks in C rather than 8 KB Python iterations
+        response.raw.decode_content = True
+        with open(temp_path, 'wb') as f:
+            shutil.copyfileobj(response.raw, f, length=DOWNLOAD_CHUNK_SIZE)
+        
+        # Check file size
+        file_size = temp_path.stat().st_size
+        if file_size < MIN_FILE_SIZE:
+            logger.error(f"Downloaded file too small: {file_size} bytes")
+            temp_path.unlink()
+            return None
+        
+        logger.info(f"Downloaded {file_size:,} bytes")
+        
+        # Replace any existing file (force overwrites stale/wrong downloads)
+        os.replace(temp_path, output_path)
+        return response.headers
+        
+    except (requests.exceptions.RequestException, Urllib3HTTPError) as e:
+        # Reading response.raw directly, a body cut off mid-transfer raises
+        # urllib3's ProtocolError / ReadTimeoutError rather than a requests error
+        logger.error(f"Download failed: {e}")
+        temp_path.unlink(missing_ok=True)
+        return None
 
 
 def validate_excel_file(file_path: Path, year: int, month: int) -> bool:
@@ -304,50 +320,55 @@ def validate_excel_file(file_path: Path, year: int, month: int) -> bool:
     try:
         logger.info(f"Validating file: {file_path.name}")
         
-        # Try to open with openpyxl
-        wb = openpyxl.load_workbook(file_path, data_only=True)
-        
-        # Check sheet names
-        if 'EQ' not in wb.sheetnames:
-            logger.error(f"Sheet 'EQ' not found. Available sheets: {wb.sheetnames}")
-            return False
-        
-        ws = wb['EQ']
-        
-        # Check for fund name in first few rows
-        # Note: The fund was previously named "Canara Robeco Emerging Equities" 
-        # and was renamed to "Canara Robeco Large and Mid Cap Fund"
-        # Accept both names for backward compatibility
-        fund_name_found = False
-        actual_fund_name = None
-        for row in ws.iter_rows(max_row=10, values_only=True):
-            row_text = ' '.join([str(cell) for cell in row if cell])
-            if 'canara robeco' in row_text.lower():
-                actual_fund_name = row_text.strip()
-                # Accept either the new name or the old name (Emerging Equities)
-                if ('large' in row_text.lower() and 'mid' in row_text.lower()) or \
-                   ('emerging' in row_text.lower() and 'equities' in row_text.lower()):
-                    fund_name_found = True
-                    logger.info(f"  Fund name found: '{actual_fund_name}'")
-                    break
-        
-        if not fund_name_found:
-            if actual_fund_name:
-                logger.error(f"Wrong fund! Expected 'Canara Robeco Large and Mid Cap Fund' (or 'Emerging Equities'), found: '{actual_fund_name}'")
-            else:
-                logger.error("Fund name not found in file")
-            return False
-        
-        # Count data rows (rough estimate)
-        data_rows = sum(1 for row in ws.iter_rows(min_row=5, max_row=200) if any(cell.value for cell in row))
-        
-        if data_rows < MIN_HOLDINGS:
-            logger.error(f"Insufficient data rows: {data_rows} (minimum {MIN_HOLDINGS})")
-            return False
-        
-        logger.info(f"[OK] File validation passed: ~{data_rows} data rows")
-        wb.close()
-        return True
+        # Open in read-only mode: rows are streamed lazily and styles are skipped
+        wb = openpyxl.load_workbook(file_path, data_only=True, read_only=True, keep_links=False)
+        try:
+            # Check sheet names
+            if 'EQ' not in wb.sheetnames:
+                logger.error(f"Sheet 'EQ' not found. Available sheets: {wb.sheetnames}")
+                return False
+            
+            ws = wb['EQ']
+            
+            # Check for fund name in first few rows
+            # Note: The fund was previously named "Canara Robeco Emerging Equities" 
+            # and was renamed to "Canara Robeco Large and Mid Cap Fund"
+            # Accept both names for backward compatibility
+            fund_name_found = False
+            actual_fund_name = None
+            for row in ws.iter_rows(max_row=10, values_only=True):
+                row_text = ' '.join(str(cell) for cell in row if cell)
+                row_lower = row_text.lower()
+                if 'canara robeco' in row_lower:
+                    actual_fund_name = row_text.strip()
+                    # Accept either the new name or the old name (Emerging Equities)
+                    if FUND_NAME_RE.search(row_lower):
+                        fund_name_found = True
+                        logger.info(f"  Fund name found: '{actual_fund_name}'")
+                        break
+            
+            if not fund_name_found:
+                if actual_fund_name:
+                    logger.error(f"Wrong fund! Expected 'Canara Robeco Large and Mid Cap Fund' (or 'Emerging Equities'), found: '{actual_fund_name}'")
+                else:
+                    logger.error("Fund name not found in file")
+                return False
+            
+            # Count data rows (rough estimate)
+            data_rows = sum(
+                1 for row in ws.iter_rows(min_row=5, max_row=200, values_only=True)
+                if any(v for v in row)
+            )
+            
+            if data_rows < MIN_HOLDINGS:
+                logger.error(f"Insufficient data rows: {data_rows} (minimum {MIN_HOLDINGS})")
+                return False
+            
+            logger.info(f"[OK] File validation passed: ~{data_rows} data rows")
+            return True
+        finally:
+            # Read-only workbooks keep the archive open until closed
+            wb.close()
         
     except Exception as e:
         logger.error(f"Validation error: {e}")
@@ -358,6 +379,9 @@ def download_monthly_portfolio(year: int, month: int, force: bool = False) -> bo
     """
     Main function to download monthly portfolio.
     
+    A cached download URL from a previous run is checked with a conditional
+    HEAD first. If it is still live (200 or 304) the pagination scan is skipped.
+    
     Args:
         year: Target year
         month: Target month (1-12)
@@ -381,21 +405,40 @@ def download_monthly_portfolio(year: int, month: int, force: bool = False) -> bo
     # Create session
     session = create_session()
     
-    # Search through pagination
+    output_path = get_output_filename(year, month)
     download_url = None
-    for page in range(1, MAX_PAGINATION + 1):
-        download_url = find_download_link(session, year, month, page)
-        if download_url:
-            break
-        time.sleep(1)  # Be polite to the server
+    
+    # Reuse the URL found by a previous run if the server still serves it
+    etag_key = f"{FUND_KEY}:{year}-{month:02d}"
+    cached = load_etag_entry(etag_key)
+    if cached:
+        logger.info(f"Checking cached download URL: {cached['url']}")
+        if check_cached_url(session, cached, logger) is not None:
+            download_url = cached['url']
+    
+    # Search pagination pages concurrently; the first page with a match wins
+    if not download_url:
+        with ThreadPoolExecutor(max_workers=PAGINATION_WORKERS) as executor:
+            futures = [
+                executor.submit(find_download_link, session, year, month, page)
+                for page in range(1, MAX_PAGINATION + 1)
+            ]
+            # Page order, not completion order, so the same page always wins
+            for future in futures:
+                download_url = future.result()
+                if download_url:
+                    # Drop pages that have not started yet
+                    for pending in futures:
+                        pending.cancel()
+                    break
     
     if not download_url:
         logger.error(f"Could not find download link after checking {MAX_PAGINATION} pages")
         return False
     
     # Download file
-    output_path = get_output_filename(year, month)
-    if not download_file(session, download_url, output_path):
+    response_headers = download_file(session, download_url, output_path)
+    if response_headers is None:
         logger.error("Download failed")
         return False
     
@@ -405,6 +448,8 @@ def download_monthly_portfolio(year: int, month: int, force: bool = False) -> bo
         output_path.unlink()
         return False
     
+    save_etag_entry(etag_key, download_url, response_headers, logger)
+    
     logger.info("="*70)
     logger.info(f"SUCCESS: Downloaded and validated: {output_path.name}")
     logger.info("="*70)
@@ -413,18 +458,12 @@ def download_monthly_portfolio(year: int, month: int, force: bool = False) -> bo
     logger.info("")
     logger.info("Running extraction to generate JSON data...")
     try:
-        import subprocess
-        extract_script = Path(__file__).parent / "extract_all_funds.py"
-        result = subprocess.run(
-            [sys.executable, str(extract_script)],
-            capture_output=True,
-            text=True,
-            cwd=Path(__file__).parent.parent
-        )
-        if result.returncode == 0:
+        # Run in this interpreter: avoids a second Python start-up and re-import
+        import extract_all_funds
+        if extract_all_funds.main():
             logger.info("[OK] Data extraction completed successfully")
         else:
-            logger.warning(f"Extraction completed with warnings. Check output above.")
+            logger.warning("Extraction completed with warnings. Check output above.")
     except Exception as e:
         logger.warning(f"Could not auto-extract data: {e}")
         logger.info("Run 'python scripts/extract_all_funds.py' manually to extract data")
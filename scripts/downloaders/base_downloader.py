@@ -7,26 +7,47 @@ needs to implement `find_download_link()` with its own navigation logic.
 
 import os
 import sys
+import json
 import time
 import logging
+import threading
 import subprocess
 from abc import ABC, abstractmethod
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Tuple
+from enum import Enum
+from typing import Mapping, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
 import openpyxl
 import pandas as pd
 
 # Shared constants
-MAX_RETRIES = 3
+MAX_RETRIES = 3       # transfers download_file() starts before giving up
 RETRY_DELAY = 5       # seconds between retries
+ADAPTER_RETRIES = 3   # session-level retries of each request (connect / 5xx)
 MIN_FILE_SIZE = 50 * 1024  # 50 KB
 MIN_HOLDINGS = 30     # minimum rows to consider a valid file
 MAX_PAGINATION = 10   # max pages to search
 
+
+class DownloadResult(Enum):
+    """
+    Outcome of BaseFundDownloader.download(). Only FAILED is falsy, so callers
+    that just test `if downloader.download(...)` keep working; values are the
+    keys of sync_all_funds' per-fund counts.
+    """
+    SUCCESS = "success"
+    FAILED = "failed"
+    SKIPPED = "skipped"
+
+    def __bool__(self) -> bool:
+        return self is not DownloadResult.FAILED
+
+
 MONTH_NAMES = [
     "January", "February", "March", "April", "May", "June",
     "July", "August", "September", "October", "November", "December"
@@ -35,6 +56,10 @@ MONTH_NAMES = [
 LOG_DIR = Path(__file__).parent.parent.parent / "logs"
 LOG_DIR.mkdir(exist_ok=True)
 
+# {"<fund_key>:YYYY-MM": {"url", "etag", "last_modified"}} from past downloads
+ETAG_STORE_FILE = LOG_DIR / ".download_etags.json"
+_etag_store_lock = threading.Lock()
+
 
 def get_target_month() -> Tuple[int, int]:
     """Return (year, month) for the previous calendar month."""
@@ -45,7 +70,7 @@ def get_target_month() -> Tuple[int, int]:
 
 
 def make_session() -> requests.Session:
-    """Create a requests session with browser-like headers."""
+    """Create a requests session with browser-like headers and pooled, retrying connections."""
     session = requests.Session()
     session.headers.update({
         "User-Agent": (
@@ -60,9 +85,21 @@ def make_session() -> requests.Session:
         "Upgrade-Insecure-Requests": "1",
         "Cache-Control": "max-age=0",
     })
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,  # enough for every sync worker thread to hold a connection
+        max_retries=Retry(total=ADAPTER_RETRIES, backoff_factor=0.3, status_forcelist=(502, 503, 504)),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
     return session
 
 
+# One session for all downloaders and months, so keep-alive connections (and
+# their TLS handshakes) are reused across funds, months and sync_server runs
+SESSION = make_session()
+
+
 def make_absolute(href: str, base_domain: str) -> str:
     """Convert a relative href to an absolute URL."""
     if href.startswith("http"):
@@ -99,42 +136,105 @@ def download_file(
     url: str,
     output_path: Path,
     logger: logging.Logger,
-) -> bool:
-    """Download a file with retry logic. Returns True on success."""
+) -> Optional[Mapping[str, str]]:
+    """
+    Download a file with retry logic. Returns the response headers on success, else None.
+
+    The session's adapter already retries opening the request (connection
+    errors and 502/503/504, up to ADAPTER_RETRIES times), so a failure there
+    is final. This loop only restarts transfers that break mid-body, which
+    the adapter cannot retry, so at worst a file is fetched MAX_RETRIES times.
+    """
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
     for attempt in range(1, MAX_RETRIES + 1):
+        logger.info(f"Downloading (attempt {attempt}/{MAX_RETRIES}): {url}")
         try:
-            logger.info(f"Downloading (attempt {attempt}/{MAX_RETRIES}): {url}")
             response = session.get(url, timeout=60, stream=True)
             response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Download failed: {e}")
+            return None
 
-            content_type = response.headers.get("Content-Type", "")
-            if not any(t in content_type.lower() for t in ("excel", "spreadsheet", "octet-stream", "zip")):
-                logger.warning(f"Unexpected Content-Type: {content_type}")
+        content_type = response.headers.get("Content-Type", "")
+        if not any(t in content_type.lower() for t in ("excel", "spreadsheet", "octet-stream", "zip")):
+            logger.warning(f"Unexpected Content-Type: {content_type}")
 
-            temp_path = output_path.with_suffix(".tmp")
-            with open(temp_path, "wb") as f:
+        temp_path = output_path.with_suffix(".tmp")
+        try:
+            with response, open(temp_path, "wb") as f:
                 for chunk in response.iter_content(chunk_size=8192):
                     if chunk:
                         f.write(chunk)
-
-            size = temp_path.stat().st_size
-            if size < MIN_FILE_SIZE:
-                logger.error(f"File too small ({size} bytes) — likely not a valid Excel file")
-                temp_path.unlink(missing_ok=True)
-                return False
-
-            os.replace(temp_path, output_path)
-            logger.info(f"Saved {size:,} bytes -> {output_path.name}")
-            return True
-
         except requests.exceptions.RequestException as e:
             logger.error(f"Download attempt {attempt} failed: {e}")
+            temp_path.unlink(missing_ok=True)
             if attempt < MAX_RETRIES:
                 time.sleep(RETRY_DELAY * attempt)
+            continue
+
+        size = temp_path.stat().st_size
+        if size < MIN_FILE_SIZE:
+            logger.error(f"File too small ({size} bytes) — likely not a valid Excel file")
+            temp_path.unlink(missing_ok=True)
+            return None
 
-    return False
+        os.replace(temp_path, output_path)
+        logger.info(f"Saved {size:,} bytes -> {output_path.name}")
+        return response.headers
+
+    return None
+
+
+def load_etag_entry(key: str) -> Optional[dict]:
+    """Return the stored download URL and validators for `key`, if any."""
+    with _etag_store_lock:
+        try:
+            with open(ETAG_STORE_FILE, "r", encoding="utf-8") as f:
+                return json.load(f).get(key)
+        except (OSError, ValueError):
+            return None
+
+
+def save_etag_entry(key: str, url: str, headers: Mapping[str, str], logger: logging.Logger) -> None:
+    """Record the download URL and its ETag / Last-Modified for `key`."""
+    with _etag_store_lock:
+        try:
+            with open(ETAG_STORE_FILE, "r", encoding="utf-8") as f:
+                store = json.load(f)
+        except (OSError, ValueError):
+            store = {}
+        store[key] = {
+            "url": url,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+        }
+        try:
+            with open(ETAG_STORE_FILE, "w", encoding="utf-8") as f:
+                json.dump(store, f, indent=2)
+        except OSError as e:
+            logger.warning(f"Could not update ETag store: {e}")
+
+
+def check_cached_url(session: requests.Session, entry: dict, logger: logging.Logger) -> Optional[int]:
+    """
+    Conditional HEAD against a previously downloaded URL.
+    Returns 304 if the file is unchanged, 200 if the URL is still live, None otherwise.
+    """
+    headers = {}
+    if entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+    try:
+        response = session.head(entry["url"], headers=headers, timeout=10, allow_redirects=True)
+    except requests.exceptions.RequestException as e:
+        logger.info(f"  Cached URL check failed: {e}")
+        return None
+    if response.status_code in (200, 304):
+        return response.status_code
+    logger.info(f"  Cached URL returned status {response.status_code}")
+    return None
 
 
 def validate_excel_generic(
@@ -193,22 +293,53 @@ def validate_excel_generic(
         return False
 
 
+EXTRACTION_LOG_TAIL = 500  # bytes of child output quoted when extraction fails
+
+# Downloaders may run in parallel threads; extract_all_funds rewrites the same
+# JSON files, so only one extraction runs at a time
+_extraction_lock = threading.Lock()
+
+
+def _file_handler(logger: logging.Logger) -> Optional[logging.FileHandler]:
+    """Return the logger's open FileHandler, if it has one."""
+    for handler in logger.handlers:
+        if isinstance(handler, logging.FileHandler) and handler.stream is not None:
+            return handler
+    return None
+
+
 def run_extraction(logger: logging.Logger) -> None:
-    """Trigger extract_all_funds.py after a successful download."""
+    """
+    Trigger extract_all_funds.py after a successful download.
+    The child writes straight into this fund's log file rather than being
+    buffered in memory; without a log file its output is captured instead.
+    On failure the tail of the output is quoted.
+    """
     extract_script = Path(__file__).parent.parent / "extract_all_funds.py"
+    fh = _file_handler(logger)
     try:
-        result = subprocess.run(
-            [sys.executable, str(extract_script)],
-            capture_output=True,
-            text=True,
-            cwd=Path(__file__).parent.parent.parent,
-        )
+        with _extraction_lock:
+            if fh is not None:
+                fh.flush()
+            result = subprocess.run(
+                [sys.executable, str(extract_script)],
+                stdout=fh.stream if fh is not None else subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                cwd=Path(__file__).parent.parent.parent,
+                env={**os.environ, "PYTHONIOENCODING": "utf-8"},  # match the log file
+            )
         if result.returncode == 0:
             logger.info("[OK] Data extraction completed")
         else:
             logger.warning("Extraction finished with warnings")
-            if result.stderr:
-                logger.warning(result.stderr[:500])
+            if fh is not None:
+                with open(fh.baseFilename, "rb") as f:
+                    f.seek(0, os.SEEK_END)
+                    f.seek(max(0, f.tell() - EXTRACTION_LOG_TAIL))
+                    tail = f.read()
+            else:
+                tail = result.stdout[-EXTRACTION_LOG_TAIL:]
+            logger.warning(tail.decode("utf-8", "replace"))
     except Exception as e:
         logger.warning(f"Could not auto-extract: {e}")
 
@@ -244,7 +375,8 @@ class BaseFundDownloader(ABC):
             fh = logging.FileHandler(log_file, encoding="utf-8")
             fh.setFormatter(fmt)
             sh = logging.StreamHandler(sys.stdout)
-            sh.setFormatter(fmt)
+            # The console is shared with funds running in parallel; name this one
+            sh.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
             self.logger.addHandler(fh)
             self.logger.addHandler(sh)
 
@@ -280,14 +412,17 @@ class BaseFundDownloader(ABC):
             return True
         return False
 
-    def download(self, year: int, month: int, force: bool = False) -> bool:
+    def download(self, year: int, month: int, force: bool = False) -> DownloadResult:
         """
         Full download pipeline:
-        1. Check if file already exists
-        2. Paginate through pages to find download link
-        3. Download file
-        4. Validate file
-        5. Trigger extraction
+        1. Check if file already exists (unless forced)
+        2. Re-check the URL from a previous download (conditional HEAD)
+        3. Otherwise paginate through pages to find download link
+        4. Download file
+        5. Validate file
+        6. Trigger extraction
+
+        Returns DownloadResult.SUCCESS, SKIPPED (file already present) or FAILED.
         """
         self.logger.info("=" * 70)
         self.logger.info(f"[{self.FUND_DISPLAY_NAME}] Downloading {MONTH_NAMES[month-1]} {year}")
@@ -295,34 +430,45 @@ class BaseFundDownloader(ABC):
 
         if not force and self.file_exists(year, month):
             self.logger.info("Skipping — file already downloaded.")
-            return True
+            return DownloadResult.SKIPPED
 
         self.DOWNLOAD_DIR.mkdir(parents=True, exist_ok=True)
-        session = make_session()
+        session = SESSION
+        output_path = self.get_output_filename(year, month)
+        etag_key = f"{self.FUND_KEY}:{year}-{month:02d}"
 
-        # Paginate to find the link
+        # Reuse the URL from a previous download while the server still serves it
         download_url = None
-        for page in range(1, MAX_PAGINATION + 1):
-            self.logger.info(f"Searching page {page}/{MAX_PAGINATION}...")
-            download_url = self.find_download_link(session, year, month, page)
-            if download_url:
-                break
-            time.sleep(1)
+        cached = load_etag_entry(etag_key)
+        if cached:
+            self.logger.info(f"Checking previous download URL: {cached['url']}")
+            if check_cached_url(session, cached, self.logger) is not None:
+                download_url = cached["url"]
+
+        # Paginate to find the link
+        if not download_url:
+            for page in range(1, MAX_PAGINATION + 1):
+                self.logger.info(f"Searching page {page}/{MAX_PAGINATION}...")
+                download_url = self.find_download_link(session, year, month, page)
+                if download_url:
+                    break
+                time.sleep(1)
 
         if not download_url:
             self.logger.error(f"Download link not found after {MAX_PAGINATION} pages")
-            return False
+            return DownloadResult.FAILED
 
-        output_path = self.get_output_filename(year, month)
-        if not download_file(session, download_url, output_path, self.logger):
+        response_headers = download_file(session, download_url, output_path, self.logger)
+        if response_headers is None:
             self.logger.error("Download failed")
-            return False
+            return DownloadResult.FAILED
 
         if not validate_excel_generic(output_path, self.FUND_NAME_KEYWORDS, self.logger):
             self.logger.error("Validation failed — removing file")
             output_path.unlink(missing_ok=True)
-            return False
+            return DownloadResult.FAILED
 
+        save_etag_entry(etag_key, download_url, response_headers, self.logger)
         self.logger.info(f"[SUCCESS] {output_path.name}")
         run_extraction(self.logger)
-        return True
+        return DownloadResult.SUCCESS
@@ -55,7 +55,7 @@ class InvescoIndiaMulticapDownloader(BaseFundDownloader):
                 ),
                 "Accept": "application/json",
             }
-            r = requests.get(url, headers=headers, timeout=30)
+            r = session.get(url, headers=headers, timeout=30)
             r.raise_for_status()
             content_type = r.headers.get("content-type", "").lower()
             if "json" in content_type:
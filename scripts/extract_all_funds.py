@@ -3,17 +3,32 @@ Extract holdings data from Excel files for multiple mutual funds.
 Add a new fund by appending an entry to the FUNDS dict below.
 """
 
+import io
 import json
 import re
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout, redirect_stderr
+from functools import partial
 from pathlib import Path
 from datetime import datetime
 
 try:
-    import pandas as pd
+    import openpyxl
+    from openpyxl.utils.exceptions import InvalidFileException
 except ImportError:
-    print("ERROR: pandas not installed. Please run: pip install pandas openpyxl")
+    print("ERROR: openpyxl not installed. Please run: pip install openpyxl")
     exit(1)
 
+try:
+    import orjson  # optional: faster JSON output, same formatting as json.dump(indent=2)
+except ImportError:
+    orjson = None
+
+# Folders in FUNDS are relative to the project root, so the script works from any cwd
+ROOT_DIR = Path(__file__).parent.parent
+
 # Fund configurations — one entry per fund.
 # Keys:
 #   name            : Display name written into JSON
@@ -66,38 +81,67 @@ FUNDS = {
     },
 }
 
+# Sheet names (lowercased) that usually hold the equity portfolio
+PREFERRED_SHEETS = {"eq", "equity", "portfolio"}
+
+# Section labels that end the equity holdings block
+SECTION_STOP_MARKERS = ("grand total", "net assets", "debt instruments", "debt securities")
+# Labels after a sub-total that mean more equity holdings follow
+MORE_EQUITY_MARKERS = ("foreign securities", "overseas", "equity", "unlisted")
+
+MONTH_NAMES = (
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December",
+)
+MONTH_BY_ABBR = {name[:3].lower(): name for name in MONTH_NAMES}
+MONTH_PATTERN = (
+    r'(jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?'
+    r'|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)'
+)
+# Month name or abbreviation followed (after any non-digits) by a 20xx year
+MONTH_YEAR_RE = re.compile(MONTH_PATTERN + r'[^0-9]*?(20\d{2})', re.IGNORECASE)
+# Year-first names (portfolio_2025_mar.xlsx); the month must be a whole word
+YEAR_MONTH_RE = re.compile(r'(20\d{2})[^0-9a-z]*' + MONTH_PATTERN + r'(?![a-z])', re.IGNORECASE)
+
+
+# Company-name normalization patterns, compiled once (applied to every holding row)
+_RE_ANNOTATION = re.compile(r'\s+[A-Z]\*\*$')
+_RE_PARENTHETICAL = re.compile(r'\s*\([^)]+\)\s*')
+_RE_FOOTNOTE = re.compile(r'[\s‡±†§\*#@^~$]+$')
+_RE_SUFFIXES = [
+    (re.compile(pattern, re.IGNORECASE), replacement)
+    for pattern, replacement in [
+        (r'\s+Limited$', ' Ltd.'),
+        (r'\s+Pvt\.?\s*Ltd\.?$', ' Ltd.'),
+        (r'\s+Private\s+Limited$', ' Ltd.'),
+        (r'\s+Ltd$', ' Ltd.'),
+        (r'\s+Ltd\.$', ' Ltd.'),
+    ]
+]
+
 
 def normalize_company_name(name):
     """Normalize company names to handle variations like 'Limited' vs 'Ltd.'."""
-    if not name or pd.isna(name):
+    if not name:
         return None
     
-    # Convert to string and strip whitespace
-    name = str(name).strip()
-    name = ' '.join(name.split())
+    # Convert to string and collapse whitespace
+    name = ' '.join(str(name).split())
     
     # Remove trailing special characters and annotations like A**, B**, etc.
-    name = re.sub(r'\s+[A-Z]\*\*$', '', name)
+    name = _RE_ANNOTATION.sub('', name)
     
     # Remove parenthetical descriptions from company names
     # e.g., "SKF India (Industrial) Ltd." -> "SKF India Ltd."
     # e.g., "Tata Motors (DVR)" -> "Tata Motors"
-    name = re.sub(r'\s*\([^)]+\)\s*', ' ', name)
+    name = _RE_PARENTHETICAL.sub(' ', name)
 
     # Remove trailing footnote markers (e.g., "KEI Industries Limited ‡")
-    name = re.sub(r'[\s‡±†§\*#@^~$]+$', '', name)
+    name = _RE_FOOTNOTE.sub('', name)
 
     # Standardize common suffixes
-    replacements = [
-        (r'\s+Limited$', ' Ltd.'),
-        (r'\s+Pvt\.?\s*Ltd\.?$', ' Ltd.'),
-        (r'\s+Private\s+Limited$', ' Ltd.'),
-        (r'\s+Ltd$', ' Ltd.'),
-        (r'\s+Ltd\.$', ' Ltd.'),
-    ]
-    
-    for pattern, replacement in replacements:
-        name = re.sub(pattern, replacement, name, flags=re.IGNORECASE)
+    for pattern, replacement in _RE_SUFFIXES:
+        name = pattern.sub(replacement, name)
     
     # Remove extra spaces
     name = ' '.join(name.split())
@@ -107,42 +151,63 @@ def normalize_company_name(name):
 
 def extract_month_year_from_filename(filename):
     """Extract month and year from filename"""
-    filename = filename.lower()
-    
-    month_map = {
-        'jan': 'January', 'january': 'January',
-        'feb': 'February', 'february': 'February',
-        'mar': 'March', 'march': 'March',
-        'apr': 'April', 'april': 'April',
-        'may': 'May',
-        'jun': 'June', 'june': 'June',
-        'jul': 'July', 'july': 'July',
-        'aug': 'August', 'august': 'August',
-        'sep': 'September', 'sept': 'September', 'september': 'September',
-        'oct': 'October', 'october': 'October',
-        'nov': 'November', 'november': 'November',
-        'dec': 'December', 'december': 'December'
-    }
-    
-    # Try to find month and year
-    for abbr, full_name in month_map.items():
-        if abbr in filename:
-            # Extract year (4 digits)
-            year_match = re.search(r'20\d{2}', filename)
-            if year_match:
-                return full_name, int(year_match.group())
-    
+    match = MONTH_YEAR_RE.search(filename)
+    if match:
+        return MONTH_BY_ABBR[match.group(1)[:3].lower()], int(match.group(2))
+    match = YEAR_MONTH_RE.search(filename)
+    if match:
+        return MONTH_BY_ABBR[match.group(2)[:3].lower()], int(match.group(1))
     return None, None
 
 
-def find_holdings_in_dataframe(df):
-    """Find holdings data in a dataframe"""
+def open_workbook(filepath):
+    """
+    Open an Excel file for row access.
+    Returns (sheet_names, workbook) for use with read_sheet_rows().
+    """
+    try:
+        wb = openpyxl.load_workbook(filepath, data_only=True, read_only=True, keep_links=False)
+        return wb.sheetnames, wb
+    except (zipfile.BadZipFile, InvalidFileException):
+        # Some AMCs serve legacy .xls content under an .xlsx name; only pandas
+        # (via xlrd) can read those, so load every sheet into row tuples up front
+        import pandas as pd
+        sheets = pd.read_excel(filepath, sheet_name=None, header=None)
+        rows_by_sheet = {
+            name: [
+                tuple(None if pd.isna(v) else v for v in row)
+                for row in df.itertuples(index=False, name=None)
+            ]
+            for name, df in sheets.items()
+        }
+        return list(rows_by_sheet), rows_by_sheet
+
+
+def read_sheet_rows(workbook, sheet_name, max_row=None):
+    """Return a sheet's rows as tuples of cell values (None for empty cells)."""
+    if isinstance(workbook, dict):
+        rows = workbook[sheet_name]
+        return rows[:max_row] if max_row else rows
+    ws = workbook[sheet_name]
+    # Read-only mode trusts the sheet's <dimension> element, which some AMC
+    # exports leave stale (e.g. "A1") and would truncate the rows returned
+    ws.reset_dimensions()
+    return list(ws.iter_rows(max_row=max_row, values_only=True))
+
+
+def row_label(row, company_col_idx):
+    """Lowercased text of a row's cells up to and including the instrument column."""
+    return ' '.join(str(cell) for cell in row[:company_col_idx + 1] if cell is not None).lower()
+
+
+def find_holdings_in_sheet(rows):
+    """Find holdings data in a sheet given as a list of row value tuples"""
     holdings = []
     
     # Find the header row
     header_row_idx = None
-    for idx, row in df.iterrows():
-        row_str = ' '.join([str(cell) for cell in row if pd.notna(cell)]).lower()
+    for idx, row in enumerate(rows):
+        row_str = ' '.join([str(cell) for cell in row if cell is not None]).lower()
         # Check for header indicators
         has_instrument = 'name of the instrument' in row_str or 'instrument' in row_str
         has_percent = '% to net' in row_str or '% to nav' in row_str or '% of nav' in row_str or '% to aum' in row_str or '% of aum' in row_str
@@ -158,12 +223,12 @@ def find_holdings_in_dataframe(df):
     print(f"  Found header row at index {header_row_idx}")
     
     # Extract column indices from header row
-    header_row = df.iloc[header_row_idx]
+    header_row = rows[header_row_idx]
     company_col_idx = None
     percent_col_idx = None
     
     for i, cell in enumerate(header_row):
-        if pd.notna(cell):
+        if cell is not None:
             cell_str = str(cell).lower().strip()
             if 'name of the instrument' in cell_str or 'name of instrument' in cell_str:
                 company_col_idx = i
@@ -180,10 +245,10 @@ def find_holdings_in_dataframe(df):
     # If all are < 1, it's decimal format (0.06274 = 6.274%)
     # If any are >= 1, it's already percentage format (6.44 = 6.44%)
     sample_values = []
-    for idx in range(header_row_idx + 1, min(header_row_idx + 30, len(df))):
-        row = df.iloc[idx]
-        percent = row.iloc[percent_col_idx] if percent_col_idx < len(row) else None
-        if pd.notna(percent):
+    for idx in range(header_row_idx + 1, min(header_row_idx + 30, len(rows))):
+        row = rows[idx]
+        percent = row[percent_col_idx] if percent_col_idx < len(row) else None
+        if percent is not None:
             try:
                 val = float(percent)
                 if val > 0:
@@ -198,32 +263,30 @@ def find_holdings_in_dataframe(df):
     print(f"  Format detection: {'Decimal (needs *100)' if needs_conversion else 'Percentage (no conversion)'}")
     
     # Extract data starting after header row
-    seen_companies = set()
+    holdings_by_name = {}  # normalized lowercase name -> holding dict
     equity_section = False
     
-    for idx in range(header_row_idx + 1, len(df)):
-        row = df.iloc[idx]
+    for idx in range(header_row_idx + 1, len(rows)):
+        row = rows[idx]
         
-        # Check if we're in equity section
-        row_str = ' '.join([str(cell) for cell in row if pd.notna(cell)]).lower()
+        # Check if we're in equity section (section labels live in the
+        # instrument column or the label cells to its left)
+        label = row_label(row, company_col_idx)
         
-        if 'equity & equity related' in row_str or 'equity' in row_str:
+        if 'equity' in label:
             equity_section = True
             continue
         
         # Stop at debt or other sections
         if equity_section:
-            if 'grand total' in row_str or 'net assets' in row_str:
-                break
-            if 'debt instruments' in row_str or 'debt securities' in row_str:
+            if any(marker in label for marker in SECTION_STOP_MARKERS):
                 break
             # Sub-total rows: only stop if no further foreign/overseas equity follows
-            if 'total' in row_str and len(holdings) > 0:
+            if 'total' in label and len(holdings) > 0:
                 has_more_equity = False
-                for next_idx in range(idx + 1, min(idx + 8, len(df))):
-                    next_row = df.iloc[next_idx]
-                    next_str = ' '.join([str(cell) for cell in next_row if pd.notna(cell)]).lower()
-                    if any(k in next_str for k in ['foreign securities', 'overseas', 'equity', 'unlisted']):
+                for next_idx in range(idx + 1, min(idx + 8, len(rows))):
+                    next_label = row_label(rows[next_idx], company_col_idx)
+                    if any(marker in next_label for marker in MORE_EQUITY_MARKERS):
                         has_more_equity = True
                         break
                 if not has_more_equity:
@@ -234,10 +297,10 @@ def find_holdings_in_dataframe(df):
             continue
         
         # Get company name and percentage
-        company = row.iloc[company_col_idx] if company_col_idx < len(row) else None
-        percent = row.iloc[percent_col_idx] if percent_col_idx < len(row) else None
+        company = row[company_col_idx] if company_col_idx < len(row) else None
+        percent = row[percent_col_idx] if percent_col_idx < len(row) else None
         
-        if pd.isna(company) or pd.isna(percent):
+        if company is None or percent is None:
             continue
         
         # Clean company name
@@ -277,22 +340,20 @@ def find_holdings_in_dataframe(df):
         
         # Check for duplicates and merge if found
         normalized_lower = normalized_name.lower()
-        if normalized_lower in seen_companies:
-            # Find existing entry and add percentages
-            for holding in holdings:
-                if holding['company'].lower() == normalized_lower:
-                    holding['percentOfNAV'] = round(holding['percentOfNAV'] + pct_val, 2)
-                    break
+        existing = holdings_by_name.get(normalized_lower)
+        if existing is not None:
+            # Merge into the existing entry
+            existing['percentOfNAV'] = round(existing['percentOfNAV'] + pct_val, 2)
             continue
         
-        seen_companies.add(normalized_lower)
-        
-        holdings.append({
+        holding = {
             "company": normalized_name,
             "percentOfNAV": round(pct_val, 2),
             "shares": None,
             "value": None
-        })
+        }
+        holdings_by_name[normalized_lower] = holding
+        holdings.append(holding)
         
         # Debug: Print first few holdings
         if len(holdings) <= 3:
@@ -313,41 +374,49 @@ def process_excel_file(filepath, fund_config):
     print(f"  Detected: {month} {year}")
     
     try:
-        # Try to read all sheets
-        excel_file = pd.ExcelFile(filepath)
-        print(f"  Sheets: {excel_file.sheet_names}")
+        # Stream sheets with openpyxl instead of building DataFrames
+        sheet_names, workbook = open_workbook(filepath)
+        print(f"  Sheets: {sheet_names}")
         
         holdings = None
         sheet_match = fund_config.get("sheet_match", "").lower()
         
-        # Try each sheet
-        for sheet_name in excel_file.sheet_names:
-            print(f"  Checking sheet: {sheet_name}")
-            
-            try:
-                if sheet_match:
-                    head = pd.read_excel(filepath, sheet_name=sheet_name, header=None, nrows=12)
-                    head_text = ' '.join(
-                        str(c) for c in head.values.flatten() if pd.notna(c)
-                    ).lower()
-                    if sheet_match not in head_text:
-                        continue
-                    print(f"  [MATCH] Sheet '{sheet_name}' matches '{sheet_match}'")
-                
-                df = pd.read_excel(filepath, sheet_name=sheet_name)
+        # Check the usual equity sheets first so other sheets are rarely read
+        preferred = [name for name in sheet_names if name.lower() in PREFERRED_SHEETS]
+        sheet_order = preferred + [name for name in sheet_names if name not in preferred]
+        
+        try:
+            # Try each sheet
+            for sheet_name in sheet_order:
+                print(f"  Checking sheet: {sheet_name}")
                 
-                if df.empty:
+                try:
+                    if sheet_match:
+                        head = read_sheet_rows(workbook, sheet_name, max_row=12)
+                        head_text = ' '.join(
+                            str(c) for row in head for c in row if c is not None
+                        ).lower()
+                        if sheet_match not in head_text:
+                            continue
+                        print(f"  [MATCH] Sheet '{sheet_name}' matches '{sheet_match}'")
+                    
+                    rows = read_sheet_rows(workbook, sheet_name)
+                    
+                    if not rows:
+                        continue
+                    
+                    sheet_holdings = find_holdings_in_sheet(rows)
+                    
+                    if sheet_holdings and len(sheet_holdings) >= 5:
+                        holdings = sheet_holdings
+                        print(f"  [OK] Found {len(holdings)} holdings in sheet '{sheet_name}'")
+                        break
+                except Exception as e:
+                    print(f"  Error reading sheet '{sheet_name}': {e}")
                     continue
-                
-                sheet_holdings = find_holdings_in_dataframe(df)
-                
-                if sheet_holdings and len(sheet_holdings) >= 5:
-                    holdings = sheet_holdings
-                    print(f"  [OK] Found {len(holdings)} holdings in sheet '{sheet_name}'")
-                    break
-            except Exception as e:
-                print(f"  Error reading sheet '{sheet_name}': {e}")
-                continue
+        finally:
+            if hasattr(workbook, 'close'):
+                workbook.close()
         
         if not holdings:
             print(f"  ERROR: No holdings found in any sheet")
@@ -367,10 +436,13 @@ def process_excel_file(filepath, fund_config):
         }
         
         filename = f"{fund_config['normalized_name']}-{month}-{year}.json"
-        output_path = Path(fund_config['data_folder']) / filename
+        output_path = ROOT_DIR / fund_config['data_folder'] / filename
         
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        if orjson is not None:
+            output_path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(output_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
         
         print(f"  [OK] Saved {len(holdings)} holdings to {filename}")
         print(f"  Top 5 holdings:")
@@ -386,7 +458,18 @@ def process_excel_file(filepath, fund_config):
         return False
 
 
-def process_fund(fund_key):
+def process_excel_file_captured(filepath, fund_config):
+    """
+    Run process_excel_file in a worker process.
+    Returns (success, output) so the parent can print each file's log in order.
+    """
+    buffer = io.StringIO()
+    with redirect_stdout(buffer), redirect_stderr(buffer):
+        success = process_excel_file(filepath, fund_config)
+    return success, buffer.getvalue()
+
+
+def process_fund(fund_key, pool=None):
     """Process all Excel files for a specific fund"""
     fund_config = FUNDS[fund_key]
     
@@ -394,8 +477,8 @@ def process_fund(fund_key):
     print(f"{fund_config['name']} - Excel Extractor")
     print("=" * 70)
     
-    excel_dir = Path(fund_config['excel_folder'])
-    data_dir = Path(fund_config['data_folder'])
+    excel_dir = ROOT_DIR / fund_config['excel_folder']
+    data_dir = ROOT_DIR / fund_config['data_folder']
     data_dir.mkdir(exist_ok=True)
     
     excel_files = sorted(excel_dir.glob("*.xlsx"))
@@ -406,9 +489,19 @@ def process_fund(fund_key):
     
     print(f"\nFound {len(excel_files)} Excel files")
     
+    # Files are independent and CPU-bound (unzip + XML parse), so spread
+    # them over worker processes; results come back in file order
+    worker = partial(process_excel_file_captured, fund_config=fund_config)
+    if pool is None:
+        with ProcessPoolExecutor() as own_pool:
+            results = list(own_pool.map(worker, excel_files))
+    else:
+        results = pool.map(worker, excel_files)
+    
     success = 0
-    for filepath in excel_files:
-        if process_excel_file(filepath, fund_config):
+    for ok, output in results:
+        print(output, end="")
+        if ok:
             success += 1
     
     print("\n" + "=" * 70)
@@ -419,7 +512,18 @@ def process_fund(fund_key):
     return success
 
 
+# Downloaders run extraction in-process, and the scheduler runs them side by
+# side; two extractions at once would race on the same JSON and manifest files
+_main_lock = threading.Lock()
+
+
 def main():
+    """Extract every fund; concurrent callers in one process run one at a time."""
+    with _main_lock:
+        return _extract_all()
+
+
+def _extract_all():
     print("\n" + "=" * 70)
     print("MULTI-FUND EXTRACTION SCRIPT")
     print("=" * 70)
@@ -427,15 +531,17 @@ def main():
     total_success = 0
     total_files = 0
     
-    for fund_key in FUNDS.keys():
-        success = process_fund(fund_key)
-        total_success += success
-        
-        # Count total files
-        excel_dir = Path(FUNDS[fund_key]['excel_folder'])
-        total_files += len(list(excel_dir.glob("*.xlsx")))
-        
-        print("\n")
+    # One worker pool shared by all funds
+    with ProcessPoolExecutor() as pool:
+        for fund_key in FUNDS.keys():
+            success = process_fund(fund_key, pool)
+            total_success += success
+            
+            # Count total files
+            excel_dir = ROOT_DIR / FUNDS[fund_key]['excel_folder']
+            total_files += len(list(excel_dir.glob("*.xlsx")))
+            
+            print("\n")
     
     print("=" * 70)
     print(f"OVERALL: {total_success}/{total_files} files processed successfully")
@@ -450,6 +556,8 @@ def main():
 
     print("=" * 70)
 
+    return total_success
+
 
 if __name__ == "__main__":
     main()
@@ -8,28 +8,64 @@ Use sync_all_funds.py --fund mirae_asset instead.
 This file is kept for backward compatibility only.
 """
 
+import html
 import os
+import re
+import shutil
 import sys
-import subprocess
-import time
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Optional, Tuple
+from typing import Iterator, Optional, Tuple
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import HTTPError as Urllib3HTTPError
+from urllib3.util.retry import Retry
+from lxml import etree
 import openpyxl
 
+try:
+    import diskcache  # optional: caches listing pages between runs
+except ImportError:
+    diskcache = None
+
+try:
+    import brotli  # noqa: F401 -- lets urllib3 decode 'br' responses
+    ACCEPT_ENCODING = 'gzip, deflate, br'
+except ImportError:
+    ACCEPT_ENCODING = 'gzip, deflate'
+
 # Configuration
 BASE_URL = "https://www.miraeassetmf.co.in/downloads/portfolio"
 FUND_NAME_PATTERN = "Mirae Asset Large & Midcap Fund"
 DOWNLOAD_DIR = Path(__file__).parent.parent / "excel-data" / "mirae-asset"
 LOG_DIR = Path(__file__).parent.parent / "logs"
 MAX_PAGINATION = 10
+PAGINATION_WORKERS = 4  # concurrent page fetches (kept low to be polite)
 MAX_RETRIES = 3
 RETRY_DELAY = 5  # seconds
 MIN_FILE_SIZE = 50 * 1024  # 50 KB
 MIN_HOLDINGS = 50
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024  # copy buffer for file downloads
+XLSX_MAGIC = b'PK\x03\x04'  # .xlsx files are ZIP archives
+# Keywords that mark a link as fund-related in debug output
+FUND_KEYWORD_RE = re.compile(r'mirae|large|mid|maebf')
+MONTH_NAMES = (
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December",
+)
+# Excel anchors in raw listing HTML: group 1 is the href, group 2 the inner markup
+LINK_RE = re.compile(
+    rb'<a\s[^>]*?href\s*=\s*["\']([^"\']+\.xlsx?)["\'][^>]*>(.*?)</a>',
+    re.IGNORECASE | re.DOTALL,
+)
+TAG_RE = re.compile(r'<[^>]*>')
+PAGE_CACHE_DIR = LOG_DIR / "http_cache"
+PAGE_CACHE_TTL = 3600  # seconds before a cached page is revalidated
 
 # Setup logging
 LOG_DIR.mkdir(exist_ok=True)
@@ -38,12 +74,15 @@ logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s',
     handlers=[
-        logging.FileHandler(log_file, encoding='utf-8'),
+        logging.FileHandler(log_file, encoding='utf-8', delay=True),  # opened on first record
         logging.StreamHandler(sys.stdout)
     ]
 )
 logger = logging.getLogger(__name__)
 
+# Sibling scripts (extract_all_funds) are imported in-process
+sys.path.insert(0, str(Path(__file__).parent))
+
 
 def get_target_month() -> Tuple[int, int]:
     """
@@ -53,26 +92,14 @@ def get_target_month() -> Tuple[int, int]:
     Returns:
         Tuple of (year, month)
     """
-    today = datetime.now()
-    
-    # Get previous month
-    if today.month == 1:
-        target_year = today.year - 1
-        target_month = 12
-    else:
-        target_year = today.year
-        target_month = today.month - 1
-    
-    return target_year, target_month
+    # Last day of the previous month
+    prev = datetime.now().replace(day=1) - timedelta(days=1)
+    return prev.year, prev.month
 
 
 def get_output_filename(year: int, month: int) -> Path:
     """Generate output filename for downloaded file."""
-    month_names = [
-        "January", "February", "March", "April", "May", "June",
-        "July", "August", "September", "October", "November", "December"
-    ]
-    month_name = month_names[month - 1]
+    month_name = MONTH_NAMES[month - 1]
     # Mirae Asset uses format: maebf_monthyear.xlsx
     filename = f"maebf_{month_name.lower()[:3]}{year}.xlsx"
     return DOWNLOAD_DIR / filename
@@ -94,7 +121,7 @@ def create_session() -> requests.Session:
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
         'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
         'Accept-Language': 'en-US,en;q=0.5',
-        'Accept-Encoding': 'gzip, deflate, br',
+        'Accept-Encoding': ACCEPT_ENCODING,
         'Connection': 'keep-alive',
         'Upgrade-Insecure-Requests': '1',
         'Sec-Fetch-Dest': 'document',
@@ -102,9 +129,138 @@ def create_session() -> requests.Session:
         'Sec-Fetch-Site': 'none',
         'Cache-Control': 'max-age=0'
     })
+    
+    # Pooled keep-alive connections; urllib3 retries on the pooled sockets
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=10,
+        max_retries=Retry(
+            total=MAX_RETRIES,
+            backoff_factor=RETRY_DELAY,
+            status_forcelist=[500, 502, 503, 504],
+        ),
+    )
+    session.mount('https://', adapter)
     return session
 
 
+_session: Optional[requests.Session] = None
+
+
+def get_session() -> requests.Session:
+    """
+    Return the module-wide session, creating it on first use.
+    Reused across download_monthly_portfolio() calls (e.g. from the scheduler)
+    so warm connections to miraeassetmf.co.in survive between runs.
+    """
+    global _session
+    if _session is None:
+        _session = create_session()
+    return _session
+
+
+_page_cache = None
+_page_cache_lock = threading.Lock()
+
+
+def get_page_cache():
+    """Return the on-disk listing-page cache, or None if diskcache is not installed."""
+    global _page_cache
+    if diskcache is None:
+        return None
+    with _page_cache_lock:
+        if _page_cache is None:
+            _page_cache = diskcache.Cache(str(PAGE_CACHE_DIR))
+    return _page_cache
+
+
+def fetch_listing_page(session: requests.Session, url: str) -> bytes:
+    """
+    Fetch a portfolio listing page, served from the disk cache when fresh.
+    Stale entries are revalidated with If-None-Match / If-Modified-Since and
+    reused on 304. Only listing HTML is cached, never the downloaded Excel files.
+    Validators are stored with the cached body, so without diskcache every
+    call is a plain GET (a 304 would leave nothing to parse).
+    """
+    cache = get_page_cache()
+    entry = cache.get(url) if cache is not None else None
+    if not isinstance(entry, dict):
+        entry = None  # nothing cached, or a bare body from an older cache format
+    headers = {}
+    if entry is not None:
+        if time.time() - entry['fetched'] < PAGE_CACHE_TTL:
+            logger.info(f"  [CACHE] Using cached page ({len(entry['body'])} bytes)")
+            return entry['body']
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+    
+    response = session.get(url, headers=headers, timeout=30)
+    if response.status_code == 304 and entry is not None:
+        logger.info(f"  [CACHE] Page not modified, reusing cached copy ({len(entry['body'])} bytes)")
+        entry['fetched'] = time.time()
+        cache.set(url, entry)
+        return entry['body']
+    
+    response.raise_for_status()
+    logger.info(f"  [OK] Page loaded successfully (status: {response.status_code}, size: {len(response.content)} bytes)")
+    
+    if cache is not None:
+        cache.set(url, {
+            'body': response.content,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'fetched': time.time(),
+        })
+    return response.content
+
+
+def make_absolute_url(href: str) -> str:
+    """Make a Mirae Asset href absolute."""
+    if href.startswith('http'):
+        return href
+    if href.startswith('/'):
+        return f"https://www.miraeassetmf.co.in{href}"
+    return f"https://www.miraeassetmf.co.in/{href}"
+
+
+def iter_excel_links(content: bytes) -> Iterator[Tuple[str, str]]:
+    """
+    Yield (href, text) for each Excel <a href> while the page is still being
+    parsed. Text (matching BeautifulSoup's get_text(strip=True)) is only built
+    for Excel links. Parsed anchors and their earlier siblings are freed as we
+    go, so memory stays bounded.
+    """
+    for _, elem in etree.iterparse(BytesIO(content), events=('end',), tag='a', html=True):
+        href = elem.get('href')
+        if href and href.endswith(('.xlsx', '.xls')):
+            yield href, ''.join(part.strip() for part in elem.itertext())
+        elem.clear(keep_tail=True)
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+
+
+def iter_candidate_links(content: bytes) -> Iterator[Tuple[str, str]]:
+    """
+    Yield (href, text) for Excel links that mention the fund, scanning the raw
+    bytes with LINK_RE instead of tokenising the whole page. Only anchors that
+    pass a cheap byte-level fund check are decoded. Falls back to the lxml
+    parser if the regex finds no Excel anchors at all (markup changed).
+    """
+    found = False
+    for m in LINK_RE.finditer(content):
+        found = True
+        raw = m.group(0).lower()
+        if b'maebf' not in raw and not (b'large' in raw and b'mid' in raw):
+            continue
+        href = html.unescape(m.group(1).decode('utf-8', 'ignore'))
+        inner = TAG_RE.split(m.group(2).decode('utf-8', 'ignore'))
+        yield href, html.unescape(''.join(part.strip() for part in inner))
+    if not found:
+        yield from iter_excel_links(content)
+
+
 def find_download_link(session: requests.Session, year: int, month: int, pagination: int) -> Optional[str]:
     """
     Search for the download link for Mirae Asset Large & Midcap Fund on a specific pagination page.
@@ -124,97 +280,51 @@ def find_download_link(session: requests.Session, year: int, month: int, paginat
     
     try:
         logger.info(f"Searching pagination {pagination}: {portfolio_url}")
-        response = session.get(portfolio_url, timeout=30)
-        response.raise_for_status()
-        
-        logger.info(f"  [OK] Page loaded successfully (status: {response.status_code}, size: {len(response.content)} bytes)")
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Look for links containing the fund name and month/year
-        links = soup.find_all('a', href=True)
+        content = fetch_listing_page(session, portfolio_url)
         
-        logger.info(f"  Found {len(links)} total links on page {pagination}")
+        month_full = MONTH_NAMES[month - 1].lower()
+        month_abbr = month_full[:3]  # jan, feb, mar, etc.
+        year_str = str(year)
+        debug = logger.isEnabledFor(logging.DEBUG)
         
-        # Log all Excel/XLS links found
-        excel_links = [link for link in links if link.get('href', '').endswith(('.xlsx', '.xls'))]
-        logger.info(f"  Found {len(excel_links)} Excel file links")
-        
-        # Month names to search for
-        month_names = [
-            "January", "February", "March", "April", "May", "June",
-            "July", "August", "September", "October", "November", "December"
-        ]
-        target_month_name = month_names[month - 1]
-        
-        # Log fund-related links
-        fund_related = []
-        for link in links:
-            href = link.get('href', '')
-            text = link.get_text(strip=True)
+        # Single pass over candidate Excel links: stop at the first
+        # exact match, remember the first relaxed match as a fallback
+        relaxed_match = None
+        for href_actual, text_actual in iter_candidate_links(content):
+            combined = text_actual.lower() + ' ' + href_actual.lower()
             
-            # Check for any "mirae", "large", "mid" mentions
-            if any(keyword in text.lower() for keyword in ['mirae', 'large', 'mid', 'maebf']):
-                fund_related.append(f"    - Text: '{text[:60]}...' | Href: {href[:80]}...")
-        
-        if fund_related:
-            logger.info(f"  Found {len(fund_related)} fund-related links:")
-            for item in fund_related[:10]:  # Log first 10
-                logger.info(item)
-        else:
-            logger.info("  No fund-related links found on this page")
-        
-        # Try exact match first
-        for link in excel_links:
-            text = link.get_text(strip=True).lower()
-            href = link.get('href', '').lower()
-            combined = text + ' ' + href
+            if debug and FUND_KEYWORD_RE.search(combined):
+                logger.debug("    - Text: %r | Href: %s", text_actual[:60], href_actual[:80])
             
-            # Check for fund name and month/year
-            if ('large' in combined and 'mid' in combined) or 'maebf' in combined:
-                if target_month_name.lower() in combined and str(year) in combined:
-                    href_actual = link.get('href', '')
-                    
-                    # Make absolute URL if relative
-                    if href_actual.startswith('http'):
-                        download_url = href_actual
-                    elif href_actual.startswith('/'):
-                        download_url = f"https://www.miraeassetmf.co.in{href_actual}"
-                    else:
-                        download_url = f"https://www.miraeassetmf.co.in/{href_actual}"
-                    
-                    logger.info(f"  [MATCH] Found exact match: {download_url}")
-                    logger.info(f"         Link text: '{link.get_text(strip=True)[:100]}'")
-                    return download_url
-        
-        # Try relaxed search: just month and year in filename
-        logger.info(f"  Trying relaxed search: '{target_month_name.lower()[:3]}' and '{year}'")
-        for link in excel_links:
-            text = link.get_text(strip=True).lower()
-            href = link.get('href', '').lower()
-            combined = text + ' ' + href
+            # Check for fund name and year
+            if not (('large' in combined and 'mid' in combined) or 'maebf' in combined):
+                continue
+            if year_str not in combined:
+                continue
+            
+            if month_full in combined:
+                download_url = make_absolute_url(href_actual)
+                logger.info(f"  [MATCH] Found exact match: {download_url}")
+                logger.info(f"         Link text: '{text_actual[:100]}'")
+                return download_url
             
-            # Match month abbreviation and year
-            month_abbr = target_month_name.lower()[:3]  # jan, feb, mar, etc.
-            if month_abbr in combined and str(year) in combined:
-                # Also check it's related to our fund
-                if 'maebf' in combined or ('large' in combined and 'mid' in combined):
-                    href_actual = link.get('href', '')
-                    
-                    if href_actual.startswith('http'):
-                        download_url = href_actual
-                    elif href_actual.startswith('/'):
-                        download_url = f"https://www.miraeassetmf.co.in{href_actual}"
-                    else:
-                        download_url = f"https://www.miraeassetmf.co.in/{href_actual}"
-                    
-                    logger.info(f"  [MATCH] Found via relaxed search: {download_url}")
-                    logger.info(f"         Link text: '{link.get_text(strip=True)[:100]}'")
-                    return download_url
+            # Relaxed: month abbreviation and year in text or filename
+            if relaxed_match is None and month_abbr in combined:
+                relaxed_match = (href_actual, text_actual)
+        
+        if relaxed_match:
+            href_actual, text_actual = relaxed_match
+            download_url = make_absolute_url(href_actual)
+            logger.info(f"  [MATCH] Found via relaxed search ('{month_abbr}' and '{year}'): {download_url}")
+            logger.info(f"         Link text: '{text_actual[:100]}'")
+            return download_url
         
         logger.info(f"  [NO MATCH] Target fund not found on page {pagination}")
         return None
         
+    except etree.LxmlError as e:
+        logger.error(f"  [ERROR] Failed to parse page {pagination}: {e}")
+        return None
     except requests.exceptions.RequestException as e:
         logger.error(f"  [ERROR] Failed to fetch page {pagination}: {e}")
         return None
@@ -222,7 +332,7 @@ def find_download_link(session: requests.Session, year: int, month: int, paginat
 
 def download_file(session: requests.Session, url: str, output_path: Path) -> bool:
     """
-    Download file from URL with retry logic.
+    Download file from URL. Retries are handled by the session's adapter.
     
     Args:
         session: Requests session
@@ -234,47 +344,54 @@ def download_file(session: requests.Session, url: str, output_path: Path) -> boo
     """
     DOWNLOAD_DIR.mkdir(parents=True, exist_ok=True)
     
-    for attempt in range(1, MAX_RETRIES + 1):
+    temp_path = output_path.with_suffix('.tmp')
+    try:
+        logger.info(f"Downloading: {url}")
+        
+        # Cheap size check before pulling the body; some CDNs reject HEAD (405)
+        # or omit Content-Length, in which case we just go ahead with the GET
         try:
-            logger.info(f"Downloading (attempt {attempt}/{MAX_RETRIES}): {url}")
-            
-            response = session.get(url, timeout=60, stream=True)
-            response.raise_for_status()
-            
-            # Check content type
-            content_type = response.headers.get('content-type', '')
-            if 'excel' not in content_type.lower() and 'spreadsheet' not in content_type.lower():
-                logger.warning(f"Unexpected content type: {content_type}")
-            
-            # Download to temporary file first
-            temp_path = output_path.with_suffix('.tmp')
-            
-            with open(temp_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-            
-            # Check file size
-            file_size = temp_path.stat().st_size
-            if file_size < MIN_FILE_SIZE:
-                logger.error(f"Downloaded file too small: {file_size} bytes")
-                temp_path.unlink()
-                return False
-            
-            logger.info(f"Downloaded {file_size:,} bytes")
-            
-            # Rename to final name
-            temp_path.rename(output_path)
-            return True
-            
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Download attempt {attempt} failed: {e}")
-            if attempt < MAX_RETRIES:
-                time.sleep(RETRY_DELAY * attempt)
-            else:
-                return False
-    
-    return False
+            head = session.head(url, timeout=15, allow_redirects=True)
+            size = int(head.headers.get('Content-Length', 0)) if head.ok else 0
+        except (requests.exceptions.RequestException, ValueError):
+            size = 0
+        if 0 < size < MIN_FILE_SIZE:
+            logger.error(f"Remote file too small: {size} bytes (HEAD Content-Length)")
+            return False
+        
+        response = session.get(url, timeout=60, stream=True)
+        response.raise_for_status()
+        
+        # Check content type
+        content_type = response.headers.get('content-type', '')
+        if 'excel' not in content_type.lower() and 'spreadsheet' not in content_type.lower():
+            logger.warning(f"Unexpected content type: {content_type}")
+        
+        # Download to temporary file first
+        # Copy the body in 1 MB blocks in C rather than 8 KB Python iterations
+        response.raw.decode_content = True
+        with open(temp_path, 'wb') as f:
+            shutil.copyfileobj(response.raw, f, length=DOWNLOAD_CHUNK_SIZE)
+        
+        # Check file size
+        file_size = temp_path.stat().st_size
+        if file_size < MIN_FILE_SIZE:
+            logger.error(f"Downloaded file too small: {file_size} bytes")
+            temp_path.unlink()
+            return False
+        
+        logger.info(f"Downloaded {file_size:,} bytes")
+        
+        # Rename to final name
+        temp_path.rename(output_path)
+        return True
+        
+    except (requests.exceptions.RequestException, Urllib3HTTPError) as e:
+        # Reading response.raw directly, a body cut off mid-transfer raises
+        # urllib3's ProtocolError / ReadTimeoutError rather than a requests error
+        logger.error(f"Download failed: {e}")
+        temp_path.unlink(missing_ok=True)
+        return False
 
 
 def validate_excel_file(file_path: Path, year: int, month: int) -> bool:
@@ -282,9 +399,10 @@ def validate_excel_file(file_path: Path, year: int, month: int) -> bool:
     Validate the downloaded Excel file.
     
     Checks:
-    1. File can be opened by openpyxl
-    2. Contains 'MAEBF' sheet
-    3. Has sufficient holdings data
+    1. File starts with the ZIP magic (rejects HTML error pages etc. cheaply)
+    2. File can be opened by openpyxl
+    3. Contains 'MAEBF' sheet
+    4. Has sufficient holdings data
     
     Args:
         file_path: Path to Excel file
@@ -297,26 +415,38 @@ def validate_excel_file(file_path: Path, year: int, month: int) -> bool:
     try:
         logger.info(f"Validating file: {file_path.name}")
         
-        # Try to open with openpyxl
-        wb = openpyxl.load_workbook(file_path, data_only=True)
-        
-        # Check sheet names - Mirae Asset uses 'MAEBF' sheet
-        if 'MAEBF' not in wb.sheetnames:
-            logger.error(f"Sheet 'MAEBF' not found. Available sheets: {wb.sheetnames}")
-            return False
-        
-        ws = wb['MAEBF']
-        
-        # Count data rows (rough estimate)
-        data_rows = sum(1 for row in ws.iter_rows(min_row=5, max_row=200) if any(cell.value for cell in row))
-        
-        if data_rows < MIN_HOLDINGS:
-            logger.error(f"Insufficient data rows: {data_rows} (minimum {MIN_HOLDINGS})")
-            return False
+        with open(file_path, 'rb') as f:
+            if f.read(len(XLSX_MAGIC)) != XLSX_MAGIC:
+                logger.error("Not a ZIP/XLSX container (HTML error page or truncated download?)")
+                return False
         
-        logger.info(f"[OK] File validation passed: ~{data_rows} data rows")
-        wb.close()
-        return True
+        # Open in read-only mode: rows are streamed lazily and styles are skipped
+        wb = openpyxl.load_workbook(file_path, data_only=True, read_only=True, keep_links=False)
+        try:
+            # Check sheet names - Mirae Asset uses 'MAEBF' sheet
+            if 'MAEBF' not in wb.sheetnames:
+                logger.error(f"Sheet 'MAEBF' not found. Available sheets: {wb.sheetnames}")
+                return False
+            
+            ws = wb['MAEBF']
+            
+            # Count data rows (rough estimate); stop once the threshold is reached
+            data_rows = 0
+            for row in ws.iter_rows(min_row=5, max_row=200, values_only=True):
+                if any(v is not None for v in row):
+                    data_rows += 1
+                    if data_rows >= MIN_HOLDINGS:
+                        break
+            
+            if data_rows < MIN_HOLDINGS:
+                logger.error(f"Insufficient data rows: {data_rows} (minimum {MIN_HOLDINGS})")
+                return False
+            
+            logger.info(f"[OK] File validation passed: at least {data_rows} data rows")
+            return True
+        finally:
+            # Read-only workbooks keep the archive open until closed
+            wb.close()
         
     except Exception as e:
         logger.error(f"Validation error: {e}")
@@ -344,19 +474,26 @@ def download_monthly_portfolio(year: int, month: int, force: bool = False) -> bo
         logger.info("File already exists. Use --force to re-download.")
         return True
     
-    # Create session
-    session = create_session()
+    # Shared session (keeps connections warm across calls)
+    session = get_session()
     
-    # Search through pagination pages
+    # Search pagination pages concurrently; the first page with a match wins.
+    # Each worker fetches and then scans its own page, so scanning one page
+    # overlaps the network wait for the others.
     download_url = None
-    for page in range(1, MAX_PAGINATION + 1):
-        download_url = find_download_link(session, year, month, page)
-        if download_url:
-            break
-        
-        # Small delay between pages to be respectful
-        if page < MAX_PAGINATION:
-            time.sleep(1)
+    with ThreadPoolExecutor(max_workers=PAGINATION_WORKERS) as executor:
+        futures = [
+            executor.submit(find_download_link, session, year, month, page)
+            for page in range(1, MAX_PAGINATION + 1)
+        ]
+        # Page order, not completion order, so the same page always wins
+        for future in futures:
+            download_url = future.result()
+            if download_url:
+                # Drop pages that have not started yet
+                for pending in futures:
+                    pending.cancel()
+                break
     
     if not download_url:
         logger.error(f"Could not find download link after checking {MAX_PAGINATION} pages")
@@ -382,18 +519,12 @@ def download_monthly_portfolio(year: int, month: int, force: bool = False) -> bo
     logger.info("")
     logger.info("Running extraction to generate JSON data...")
     try:
-        import subprocess
-        extract_script = Path(__file__).parent / "extract_all_funds.py"
-        result = subprocess.run(
-            [sys.executable, str(extract_script)],
-            capture_output=True,
-            text=True,
-            cwd=Path(__file__).parent.parent
-        )
-        if result.returncode == 0:
+        # Run in this interpreter: avoids a second Python start-up and re-import
+        import extract_all_funds
+        if extract_all_funds.main():
             logger.info("[OK] Data extraction completed successfully")
         else:
-            logger.warning(f"Extraction completed with warnings. Check output above.")
+            logger.warning("Extraction completed with warnings. Check output above.")
     except Exception as e:
         logger.warning(f"Could not auto-extract data: {e}")
         logger.info("Run 'python scripts/extract_all_funds.py' manually to extract data")
@@ -12,33 +12,52 @@ from pathlib import Path
 # Add scripts to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from canara_auto_download import download_monthly_portfolio, get_target_month
+import canara_auto_download
+import mirae_auto_download
 
+# Scheduler job id -> (display name, downloader module)
+FUND_JOBS = {
+    'canara_download': ('Canara Robeco', canara_auto_download),
+    'mirae_download': ('Mirae Asset', mirae_auto_download),
+}
+
+# Each downloader calls basicConfig on import and only the first call takes
+# effect, so every fund would log into Canara's file. Replace that with one
+# console handler here and give each fund's logger its own log file.
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
+    format=LOG_FORMAT,
+    handlers=[logging.StreamHandler(sys.stdout)],
+    force=True,
 )
+for _, downloader in FUND_JOBS.values():
+    file_handler = logging.FileHandler(downloader.log_file, encoding='utf-8', delay=True)
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    downloader.logger.addHandler(file_handler)
 logger = logging.getLogger(__name__)
 
 
-def scheduled_download():
+def scheduled_download(fund_name, downloader):
     """Job function called by scheduler."""
-    logger.info("Scheduled download triggered")
-    year, month = get_target_month()
-    success = download_monthly_portfolio(year, month)
+    logger.info(f"Scheduled {fund_name} download triggered")
+    year, month = downloader.get_target_month()
+    success = downloader.download_monthly_portfolio(year, month)
     
     if success:
-        logger.info("Download completed successfully")
+        logger.info(f"{fund_name} download completed successfully")
     else:
-        logger.error("Download failed")
+        logger.error(f"{fund_name} download failed")
 
 
 def main():
     scheduler = BlockingScheduler()
     
-    # Run on 5th of each month at 6 AM
+    # Run on 5th of each month at 6 AM. Each fund is its own job on the same
+    # trigger, so the scheduler's thread pool runs the downloads side by side.
     trigger = CronTrigger(day=5, hour=6, minute=0)
-    scheduler.add_job(scheduled_download, trigger, id='canara_download')
+    for job_id, (fund_name, downloader) in FUND_JOBS.items():
+        scheduler.add_job(scheduled_download, trigger, id=job_id, args=(fund_name, downloader))
     
     logger.info("Scheduler started. Will run on 5th of each month at 6:00 AM")
     logger.info("Press Ctrl+C to exit")
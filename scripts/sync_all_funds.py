@@ -8,32 +8,67 @@ Usage:
     python scripts/sync_all_funds.py --year 2026 --month 2  # Sync specific month
     python scripts/sync_all_funds.py --fund canara_robeco   # Sync a single fund
     python scripts/sync_all_funds.py --force                # Force re-download
+    python scripts/sync_all_funds.py --workers 8            # Download up to 8 funds at once
     python scripts/sync_all_funds.py --list                 # List all registered funds
 """
 
+import io
+import os
 import sys
 import importlib
 import inspect
 import logging
 import subprocess
+import threading
+from logging.handlers import RotatingFileHandler
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import List, Tuple, Dict
 
-# Setup logging
-LOG_DIR = Path(__file__).parent.parent / "logs"
-LOG_DIR.mkdir(exist_ok=True)
-log_file = LOG_DIR / f"sync_all_funds_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
-
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(log_file, encoding='utf-8'),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+SCRIPTS_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = SCRIPTS_DIR.parent
+PYTHON = sys.executable
+MANIFEST_SCRIPT = SCRIPTS_DIR / "generate_manifest.py"
+
+# Sibling scripts (and downloaders/) are imported in-process
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+LOG_DIR = PROJECT_ROOT / "logs"
+log_file = LOG_DIR / "sync_all_funds.log"
+LOG_MAX_BYTES = 5_000_000
+LOG_BACKUP_COUNT = 5  # sync_all_funds.log.1 ... .5, ~25 MB in total
 logger = logging.getLogger(__name__)
+_logging_configured = False
+
+SYNC_WORKERS = 4  # funds downloaded at once
+BANNER = "\n".join(["=" * 70, "  MUTUAL FUND DATA SYNC", "=" * 70])
+
+
+def setup_logging() -> None:
+    """
+    Send log records to the rotating sync log and stdout. Called from main()
+    rather than at import, so processes that merely import this module (such
+    as spawned pool workers) never open the log file; the file itself is only
+    opened on the first record. Safe to call again from a long-lived worker.
+    """
+    global _logging_configured
+    if _logging_configured:
+        return
+    LOG_DIR.mkdir(exist_ok=True)
+    # Funds download in parallel threads, so name the logger (the fund key) on every line
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    for handler in (
+        RotatingFileHandler(log_file, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT,
+                            encoding='utf-8', delay=True),
+        logging.StreamHandler(sys.stdout),
+    ):
+        handler.setFormatter(formatter)
+        root.addHandler(handler)
+    _logging_configured = True
 
 
 def get_recent_months(count: int = 1) -> List[Tuple[int, int]]:
@@ -41,13 +76,12 @@ def get_recent_months(count: int = 1) -> List[Tuple[int, int]]:
     months = []
     current = datetime.now()
     year, month = current.year, current.month
-    for i in range(count):
-        m = month - i
-        y = year
-        while m <= 0:
-            m += 12
-            y -= 1
-        months.append((y, m))
+    for _ in range(count):
+        months.append((year, month))
+        month -= 1
+        if month == 0:
+            month = 12
+            year -= 1
     return months
 
 
@@ -58,7 +92,7 @@ def discover_downloaders() -> Dict[str, object]:
     """
     from downloaders.base_downloader import BaseFundDownloader
 
-    downloaders_dir = Path(__file__).parent / "downloaders"
+    downloaders_dir = SCRIPTS_DIR / "downloaders"
     discovered: Dict[str, object] = {}
 
     for py_file in sorted(downloaders_dir.glob("*.py")):
@@ -82,61 +116,166 @@ def discover_downloaders() -> Dict[str, object]:
     return discovered
 
 
+def sync_fund(fund_key: str, downloader, months: List[Tuple[int, int]], force: bool) -> Dict[str, int]:
+    """Download every requested month for one fund and return its result counts."""
+    from downloaders.base_downloader import DownloadResult
+
+    result = {"success": 0, "failed": 0, "skipped": 0}
+    for year, month in months:
+        logger.info("-" * 70)
+        try:
+            result[downloader.download(year, month, force=force).value] += 1
+        except Exception as e:
+            logger.error(f"Unexpected error for {fund_key}: {e}")
+            result[DownloadResult.FAILED.value] += 1
+    if result["skipped"]:
+        logger.info(f"[{fund_key}] Skipped {result['skipped']} already-synced month(s)")
+    return result
+
+
+def run_script(script_path: Path, label: str) -> int:
+    """
+    Run a sibling script, logging its output line by line as it arrives.
+    stderr is merged into stdout. Returns the exit code.
+    """
+    proc = subprocess.Popen(
+        [PYTHON, str(script_path)],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+        bufsize=1,
+        cwd=PROJECT_ROOT,
+        # Unbuffered child so lines show up live; UTF-8 to match our decoding
+        env={**os.environ, "PYTHONUNBUFFERED": "1", "PYTHONIOENCODING": "utf-8"},
+    )
+    with proc.stdout:
+        for line in proc.stdout:
+            line = line.rstrip()
+            if line:
+                logger.info(f"  [{label}] {line}")
+    return proc.wait()
+
+
+class LogWriter(io.TextIOBase):
+    """Text stream that logs each complete line written to it under a label."""
+
+    def __init__(self, label: str):
+        super().__init__()
+        self.label = label
+        self._partial = ""
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        # print() writes the text and the newline separately; only split when
+        # a line is actually complete
+        if "\n" not in text:
+            self._partial += text
+            return len(text)
+        *lines, self._partial = (self._partial + text).split("\n")
+        for line in lines:
+            self._emit(line)
+        return len(text)
+
+    def close(self) -> None:
+        if self._partial:
+            self._emit(self._partial)
+            self._partial = ""
+        super().close()
+
+    def _emit(self, line: str) -> None:
+        line = line.rstrip()
+        if line:
+            logger.info(f"  [{self.label}] {line}")
+
+
+class ThreadRedirect(io.TextIOBase):
+    """
+    Stand-in for sys.stdout/sys.stderr that sends writes from the thread that
+    installed it to `target`. Every other thread keeps writing to `original`.
+    """
+
+    def __init__(self, original, target: io.TextIOBase):
+        super().__init__()
+        self.original = original
+        self.target = target
+        self.thread_id = threading.get_ident()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        if threading.get_ident() == self.thread_id:
+            return self.target.write(text)
+        return self.original.write(text)
+
+    def flush(self) -> None:
+        self.original.flush()
+
+    @property
+    def encoding(self):
+        return self.original.encoding
+
+    def isatty(self) -> bool:
+        return self.original.isatty()
+
+    def fileno(self) -> int:
+        return self.original.fileno()
+
+
+def run_in_process(func, label: str):
+    """
+    Call a sibling script's main(), routing the prints it makes on this thread
+    through the logger. Other threads in the process are left alone.
+    """
+    writer = LogWriter(label)
+    saved = sys.stdout, sys.stderr
+    sys.stdout = ThreadRedirect(saved[0], writer)
+    sys.stderr = ThreadRedirect(saved[1], writer)
+    try:
+        return func()
+    finally:
+        sys.stdout, sys.stderr = saved
+        writer.close()
+
+
 def extract_all_data() -> bool:
-    """Run extract_all_funds.py to process all downloaded Excel files."""
+    """Run extract_all_funds.main() to process all downloaded Excel files."""
     logger.info("=" * 70)
     logger.info("EXTRACTING: All fund data to JSON")
     logger.info("=" * 70)
-    script_path = Path(__file__).parent / "extract_all_funds.py"
     try:
-        result = subprocess.run(
-            [sys.executable, str(script_path)],
-            capture_output=True,
-            text=True,
-            cwd=Path(__file__).parent.parent,
-        )
-        if result.stdout:
-            for line in result.stdout.split("\n"):
-                if line.strip():
-                    logger.info(f"  [Extract] {line}")
-        if result.returncode == 0:
-            logger.info("OK: Data extraction completed")
-            return True
-        else:
-            logger.error(f"FAILED: Data extraction exit code {result.returncode}")
-            if result.stderr:
-                logger.error(result.stderr[:500])
-            return False
-    except Exception as e:
-        logger.error(f"FAILED: Data extraction error: {e}")
+        import extract_all_funds
+        extracted = run_in_process(extract_all_funds.main, "Extract")
+    except (Exception, SystemExit) as e:
+        logger.error(f"FAILED: Data extraction error: {e!r}")
         return False
+    logger.info(f"OK: Data extraction completed ({extracted} file(s))")
+    return True
 
 
 def verify_data() -> bool:
-    """Run verify_data.py to check data quality."""
+    """Run verify_data.main() to check data quality."""
     logger.info("=" * 70)
     logger.info("VERIFYING: Data quality")
     logger.info("=" * 70)
-    script_path = Path(__file__).parent / "verify_data.py"
     try:
-        result = subprocess.run(
-            [sys.executable, str(script_path)],
-            capture_output=True,
-            text=True,
-            cwd=Path(__file__).parent.parent,
-        )
-        if result.stdout:
-            logger.info(result.stdout)
-        return result.returncode == 0
-    except Exception as e:
-        logger.error(f"FAILED: Verification error: {e}")
+        import verify_data as verify_mod
+        return bool(run_in_process(verify_mod.main, "Verify"))
+    except (Exception, SystemExit) as e:
+        logger.error(f"FAILED: Verification error: {e!r}")
         return False
 
 
-def main():
-    """Main entry point."""
+def main(argv=None):
+    """Main entry point. `argv` defaults to sys.argv[1:] (sync_server passes [])."""
     import argparse
 
+    setup_logging()
+
     parser = argparse.ArgumentParser(
         description="Sync all mutual fund data",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -148,6 +287,7 @@ Examples:
   python scripts/sync_all_funds.py --fund canara_robeco   # Sync one fund only
   python scripts/sync_all_funds.py --list                 # List all registered funds
   python scripts/sync_all_funds.py --force                # Force re-download
+  python scripts/sync_all_funds.py --workers 1            # Download one fund at a time
         """,
     )
     parser.add_argument("--year", type=int, help="Target year")
@@ -155,31 +295,27 @@ Examples:
     parser.add_argument("--months", type=int, default=1, help="Number of recent months (default: 1)")
     parser.add_argument("--fund", type=str, help="Sync a single fund by FUND_KEY")
     parser.add_argument("--force", action="store_true", help="Force re-download even if file exists")
+    parser.add_argument("--workers", type=int, default=SYNC_WORKERS,
+                        help=f"Funds to download concurrently (default: {SYNC_WORKERS})")
     parser.add_argument("--skip-extraction", action="store_true", help="Skip extraction step")
     parser.add_argument("--skip-verification", action="store_true", help="Skip verification step")
     parser.add_argument("--list", action="store_true", help="List all registered fund downloaders")
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
-    logger.info("=" * 70)
-    logger.info("  MUTUAL FUND DATA SYNC")
-    logger.info("=" * 70)
-    logger.info(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    logger.info(f"Log: {log_file}")
-    logger.info("")
-
-    # Add scripts/ to sys.path so relative imports work when called directly
-    scripts_dir = str(Path(__file__).parent)
-    if scripts_dir not in sys.path:
-        sys.path.insert(0, scripts_dir)
+    logger.info(
+        f"{BANNER}\n"
+        f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+        f"Log: {log_file}\n"
+    )
 
     # Discover all fund downloaders
     all_downloaders = discover_downloaders()
 
     if args.list:
-        logger.info(f"Registered fund downloaders ({len(all_downloaders)}):")
-        for key, dl in sorted(all_downloaders.items()):
-            logger.info(f"  {key:25s} -> {dl.FUND_DISPLAY_NAME}")
+        lines = [f"Registered fund downloaders ({len(all_downloaders)}):"]
+        lines += [f"  {key:25s} -> {dl.FUND_DISPLAY_NAME}" for key, dl in sorted(all_downloaders.items())]
+        logger.info("\n".join(lines))
         return
 
     # Filter to single fund if requested
@@ -191,38 +327,34 @@ Examples:
     else:
         downloaders_to_run = all_downloaders
 
-    logger.info(f"Funds to sync: {len(downloaders_to_run)}")
-    for key, dl in downloaders_to_run.items():
-        logger.info(f"  - {dl.FUND_DISPLAY_NAME}")
-    logger.info("")
+    lines = [f"Funds to sync: {len(downloaders_to_run)}"]
+    lines += [f"  - {dl.FUND_DISPLAY_NAME}" for dl in downloaders_to_run.values()]
+    logger.info("\n".join(lines) + "\n")
 
     # Determine months to sync
     if args.year and args.month:
         months_to_sync = [(args.year, args.month)]
     else:
         months_to_sync = get_recent_months(args.months)
+    months_to_sync = list(dict.fromkeys(months_to_sync))  # drop duplicates, keep order
 
-    logger.info(f"Months to sync: {len(months_to_sync)}")
-    for y, m in months_to_sync:
-        logger.info(f"  - {datetime(y, m, 1).strftime('%B %Y')}")
-    logger.info("")
+    lines = [f"Months to sync: {len(months_to_sync)}"]
+    lines += [f"  - {datetime(y, m, 1).strftime('%B %Y')}" for y, m in months_to_sync]
+    logger.info("\n".join(lines) + "\n")
 
-    # Run each downloader for each month
+    # Run funds concurrently (each hits a different AMC site); months stay
+    # serial within a fund so no single site sees parallel requests
     results: Dict[str, Dict] = {}
-    for fund_key, downloader in downloaders_to_run.items():
-        results[fund_key] = {"success": 0, "failed": 0, "skipped": 0}
-        for year, month in months_to_sync:
-            logger.info("-" * 70)
-            try:
-                ok = downloader.download(year, month, force=args.force)
-                if ok:
-                    results[fund_key]["success"] += 1
-                else:
-                    results[fund_key]["failed"] += 1
-            except Exception as e:
-                logger.error(f"Unexpected error for {fund_key}: {e}")
-                results[fund_key]["failed"] += 1
-        logger.info("")
+    workers = max(1, min(len(downloaders_to_run), args.workers))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(sync_fund, fund_key, downloader, months_to_sync, args.force): fund_key
+            for fund_key, downloader in downloaders_to_run.items()
+        }
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+    results = {key: results[key] for key in downloaders_to_run}  # registry order for the summary
+    logger.info("")
 
     # Extraction
     extraction_ok = True
@@ -234,22 +366,14 @@ Examples:
             logger.info("=" * 70)
             logger.info("GENERATING: JSON Manifest for UI")
             logger.info("=" * 70)
-            manifest_script = Path(__file__).parent / "generate_manifest.py"
             try:
-                manifest_result = subprocess.run(
-                    [sys.executable, str(manifest_script)],
-                    capture_output=True,
-                    text=True,
-                    cwd=Path(__file__).parent.parent
-                )
-                if manifest_result.returncode == 0:
+                manifest_returncode = run_script(MANIFEST_SCRIPT, "Manifest")
+                if manifest_returncode == 0:
                     logger.info("OK: Manifest generation completed")
                 else:
                     logger.error(
-                        f"FAILED: Manifest generation exit code {manifest_result.returncode}"
+                        f"FAILED: Manifest generation exit code {manifest_returncode}"
                     )
-                    if manifest_result.stderr:
-                        logger.error(manifest_result.stderr[:500])
             except Exception as e:
                 logger.error(f"FAILED: Manifest generation error: {e}")
                 
@@ -261,32 +385,36 @@ Examples:
         verification_ok = verify_data()
         logger.info("")
 
-    # Summary
-    logger.info("=" * 70)
-    logger.info("  SYNC SUMMARY")
-    logger.info("=" * 70)
+    # Summary (logged as one record)
+    lines = ["=" * 70, "  SYNC SUMMARY", "=" * 70]
     total_success = 0
     total_failed = 0
+    total_skipped = 0
     for fund_key, res in results.items():
         dl = downloaders_to_run[fund_key]
-        status = "OK" if res["failed"] == 0 else "PARTIAL" if res["success"] > 0 else "FAILED"
-        logger.info(
+        have_data = res["success"] + res["skipped"] > 0
+        status = "OK" if res["failed"] == 0 else "PARTIAL" if have_data else "FAILED"
+        lines.append(
             f"  [{status:7s}] {dl.FUND_DISPLAY_NAME}: "
-            f"{res['success']} ok, {res['failed']} failed"
+            f"{res['success']} ok, {res['failed']} failed, {res['skipped']} skipped"
         )
         total_success += res["success"]
         total_failed += res["failed"]
-
-    logger.info("")
-    logger.info(f"  Total: {total_success} succeeded, {total_failed} failed")
-    logger.info(f"  Extraction:  {'OK' if extraction_ok else 'FAILED'}")
-    logger.info(f"  Verification: {'OK' if verification_ok else 'FAILED'}")
-    logger.info(f"  Completed: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    logger.info("=" * 70)
+        total_skipped += res["skipped"]
+
+    lines += [
+        "",
+        f"  Total: {total_success} succeeded, {total_failed} failed, {total_skipped} skipped",
+        f"  Extraction:  {'OK' if extraction_ok else 'FAILED'}",
+        f"  Verification: {'OK' if verification_ok else 'FAILED'}",
+        f"  Completed: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+        "=" * 70,
+    ]
+    logger.info("\n".join(lines))
 
     if not extraction_ok:
         sys.exit(1)
-    elif total_failed > 0 and total_success == 0:
+    elif total_failed > 0 and total_success + total_skipped == 0:
         logger.warning("All downloads failed — files may not be published yet")
         sys.exit(0)
     else:
@@ -1,67 +1,304 @@
 """
 Simple HTTP server to handle sync requests from the UI
-Runs sync_all_funds.py when requested
+Runs sync_all_funds.main() in a persistent worker process when requested
 """
 
 import sys
-import subprocess
 import json
+import logging
+import multiprocessing
+import queue
+import threading
+import time
+from collections import deque
 from pathlib import Path
-from http.server import HTTPServer, SimpleHTTPRequestHandler
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
 import urllib.parse
 
+try:
+    import orjson  # optional: serialises straight to bytes
+except ImportError:
+    orjson = None
+
+# The worker process imports sync_all_funds and its sibling scripts from here
+sys.path.insert(0, str(Path(__file__).parent))
+
+SYNC_TIMEOUT = 300  # seconds a sync may run before its worker process is killed
+# Extra seconds a request waits beyond SYNC_TIMEOUT before giving up on the worker
+# (covers starting the process and killing it)
+SYNC_WAIT_MARGIN = 30
+CAPTURE_TAIL_LINES = 50  # log records kept per job; only the tail is returned
+JOB_QUEUE = queue.Queue()
+# Held from the moment a sync is accepted until the worker finishes or kills
+# it, so a second POST gets 409, not a duplicate
+SYNC_LOCK = threading.Lock()
+
+
+def _dumps(obj) -> bytes:
+    """Serialise a response body to UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+
+class SyncJob:
+    """
+    A queued sync request; the worker fills in returncode/output and sets `done`.
+    `timed_out` is set if the sync ran past SYNC_TIMEOUT and was killed.
+    Streaming jobs also get each log line pushed onto `progress` as it happens.
+    """
+
+    def __init__(self, stream=False):
+        self.done = threading.Event()
+        self.returncode = None
+        self.timed_out = False
+        self.output = ""
+        self.progress = queue.Queue() if stream else None
+
+
+class PipeLogHandler(logging.Handler):
+    """Sends each log record emitted in the sync process to the server as a line."""
+
+    def __init__(self, conn):
+        super().__init__()
+        self.conn = conn
+
+    def emit(self, record):
+        self.conn.send(("line", self.format(record)))
+
+
+def run_sync_all_funds():
+    """Default sync entry point for the worker process."""
+    import sync_all_funds
+
+    sync_all_funds.main([])
+
+
+def _sync_process(conn, sync_main):
+    """
+    Body of the worker process: call `sync_main` once per request received on
+    `conn`, keeping downloader modules, pandas/openpyxl and sessions imported
+    between them. Sends ("line", text) per log record, then ("done", returncode).
+    """
+    handler = PipeLogHandler(conn)
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    logging.getLogger().addHandler(handler)
+    while True:
+        try:
+            conn.recv()
+        except EOFError:
+            return  # server went away
+        try:
+            sync_main()
+            returncode = 0
+        except SystemExit as e:
+            # main() ends with sys.exit(); None means success
+            returncode = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        except Exception:
+            logging.getLogger(__name__).exception("Sync crashed")
+            returncode = 1
+        conn.send(("done", returncode))
+
+
+class SyncWorker:
+    """
+    Owns the worker process that runs syncs. A sync still running after
+    SYNC_TIMEOUT is killed with its process, and the next job starts a
+    fresh one, so a hung sync cannot hold SYNC_LOCK forever.
+
+    `sync_main` must be a module-level function so it can be sent to the
+    spawned process.
+    """
+
+    def __init__(self, sync_main=run_sync_all_funds):
+        self.sync_main = sync_main
+        self.process = None
+        self.conn = None
+
+    def _ensure_process(self):
+        if self.process is not None and self.process.is_alive():
+            return
+        # spawn, not fork: the server has live threads to not copy. Not a
+        # daemon: extraction and verification start their own process pools,
+        # which daemonic processes may not do, so close() ends it instead
+        ctx = multiprocessing.get_context("spawn")
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_sync_process, args=(child_conn, self.sync_main), name="sync-worker")
+        self.process.start()
+        child_conn.close()
+
+    def _kill(self):
+        if self.process is not None:
+            self.process.kill()
+            self.process.join()
+        if self.conn is not None:
+            self.conn.close()
+        self.process = self.conn = None
+
+    def close(self, timeout=5):
+        """Stop the worker process: closing the pipe ends its loop, then it is killed if still busy."""
+        if self.process is None:
+            return
+        self.conn.close()
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.process = self.conn = None
+
+    def run(self, job):
+        """Run one job to completion or timeout, relaying its log lines."""
+        lines = deque(maxlen=CAPTURE_TAIL_LINES)
+        try:
+            self._ensure_process()
+            deadline = time.monotonic() + SYNC_TIMEOUT
+            self.conn.send("sync")
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not self.conn.poll(remaining):
+                    logging.getLogger(__name__).error(f"Sync exceeded {SYNC_TIMEOUT}s; killing worker process")
+                    self._kill()
+                    job.timed_out = True
+                    break
+                kind, value = self.conn.recv()
+                if kind == "done":
+                    job.returncode = value
+                    break
+                lines.append(value)
+                if job.progress is not None:
+                    job.progress.put(value)
+        except (EOFError, OSError):
+            logging.getLogger(__name__).exception("Sync worker process died")
+            self._kill()
+            job.returncode = 1
+        finally:
+            job.output = "\n".join(lines)
+            job.done.set()
+
+
+def _worker_loop(worker):
+    """Serve sync jobs one at a time through a single SyncWorker."""
+    while True:
+        job = JOB_QUEUE.get()
+        try:
+            worker.run(job)
+        except Exception:
+            # Keep serving: this thread is the only consumer of JOB_QUEUE
+            logging.getLogger(__name__).exception("Sync worker failed")
+        finally:
+            SYNC_LOCK.release()
+
+
+def start_worker(worker):
+    """Start the thread that feeds jobs to `worker`'s process."""
+    thread = threading.Thread(target=_worker_loop, args=(worker,), name="sync-worker", daemon=True)
+    thread.start()
+    return thread
+
+
 class SyncHandler(SimpleHTTPRequestHandler):
     """Custom handler for sync requests"""
     
+    # HTTP/1.1 for chunked progress streaming; every response sets Content-Length
+    protocol_version = "HTTP/1.1"
+    
     def do_POST(self):
         """Handle POST requests for sync"""
+        # The body is unused, but on a keep-alive connection it must be read
+        # off the socket on every path or it is parsed as the next request
+        length = int(self.headers.get('Content-Length') or 0)
+        if length > 0:
+            self.rfile.read(length)
         if self.path == '/api/sync':
             self.handle_sync()
         else:
             self.send_error(404, "Not Found")
     
     def handle_sync(self):
-        """Execute sync_all_funds.py script"""
+        """Hand a sync job to the worker and wait for it to finish"""
+        if not SYNC_LOCK.acquire(blocking=False):
+            self.send_error(409, "Sync already in progress")
+            return
         try:
-            # Get the project root directory
-            project_root = Path(__file__).parent.parent
-            sync_script = project_root / "scripts" / "sync_all_funds.py"
-            
-            # Run the sync script
-            result = subprocess.run(
-                [sys.executable, str(sync_script)],
-                cwd=str(project_root),
-                capture_output=True,
-                text=True,
-                timeout=300  # 5 minute timeout
-            )
+            # Clients that ask for NDJSON get live progress; others get one JSON body
+            stream = 'application/x-ndjson' in self.headers.get('Accept', '')
+            job = SyncJob(stream=stream)
+            JOB_QUEUE.put(job)
+            if stream:
+                self.stream_sync(job)
+                return
+            # The worker kills the sync at SYNC_TIMEOUT; the margin only
+            # matters if the worker itself is stuck
+            if not job.done.wait(timeout=SYNC_TIMEOUT + SYNC_WAIT_MARGIN) or job.timed_out:
+                self.send_error(504, "Sync timeout - operation took too long")
+                return
+            if job.returncode is None:
+                self.send_error(500, "Sync failed: worker error")
+                return
             
             # Prepare response
             response = {
-                "success": result.returncode == 0,
-                "message": "Sync completed successfully" if result.returncode == 0 else "Sync completed with warnings",
-                "stdout": result.stdout[-1000:] if result.stdout else "",  # Last 1000 chars
-                "stderr": result.stderr[-500:] if result.stderr else ""
+                "success": job.returncode == 0,
+                "message": "Sync completed successfully" if job.returncode == 0 else "Sync completed with warnings",
+                "stdout": job.output[-1000:],  # Last 1000 chars
+                "stderr": ""  # errors are part of the captured log above
             }
             
             # Send response
+            body = _dumps(response)
             self.send_response(200)
             self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
             self.send_header('Access-Control-Allow-Origin', '*')
             self.end_headers()
-            self.wfile.write(json.dumps(response).encode())
+            self.wfile.write(body)
             
-        except subprocess.TimeoutExpired:
-            self.send_error(504, "Sync timeout - operation took too long")
         except Exception as e:
             self.send_error(500, f"Sync failed: {str(e)}")
     
+    def stream_sync(self, job):
+        """
+        Send the job's log lines as chunked NDJSON ({"line": ...}) while it runs,
+        then a final {"done": true, "success", "returncode"} record.
+        """
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.end_headers()
+        
+        deadline = time.monotonic() + SYNC_TIMEOUT + SYNC_WAIT_MARGIN
+        try:
+            while True:
+                try:
+                    line = job.progress.get(timeout=0.5)
+                except queue.Empty:
+                    # The worker sets `done` only after its last line is queued
+                    if job.timed_out or time.monotonic() > deadline:
+                        final = {"done": False, "success": False, "error": "Sync timeout - operation took too long"}
+                        break
+                    if job.done.is_set():
+                        final = {"done": True, "success": job.returncode == 0, "returncode": job.returncode}
+                        break
+                    continue
+                self._write_chunk(_dumps({"line": line}) + b"\n")
+            self._write_chunk(_dumps(final) + b"\n")
+            self.wfile.write(b"0\r\n\r\n")
+            self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # client went away; the sync itself carries on
+    
+    def _write_chunk(self, data):
+        self.wfile.write(f"{len(data):X}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+    
     def do_OPTIONS(self):
         """Handle CORS preflight"""
         self.send_response(200)
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'POST, OPTIONS')
         self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.send_header('Content-Length', '0')
         self.end_headers()
     
     def log_message(self, format, *args):
@@ -74,7 +311,10 @@ class SyncHandler(SimpleHTTPRequestHandler):
 def run_server(port=8001):
     """Run the sync server"""
     server_address = ('', port)
-    httpd = HTTPServer(server_address, SyncHandler)
+    worker = SyncWorker()
+    start_worker(worker)
+    # Threaded so CORS preflights and 409 replies aren't stuck behind a running sync
+    httpd = ThreadingHTTPServer(server_address, SyncHandler)
     print(f"Sync API server running on http://localhost:{port}")
     print(f"POST to http://localhost:{port}/api/sync to trigger sync")
     print("Press Ctrl+C to stop")
@@ -83,6 +323,9 @@ def run_server(port=8001):
     except KeyboardInterrupt:
         print("\nShutting down sync server...")
         httpd.shutdown()
+    finally:
+        # The worker process is not a daemon, so end it before exiting
+        worker.close()
 
 
 if __name__ == "__main__":
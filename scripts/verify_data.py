@@ -2,33 +2,134 @@
 Verify extracted data quality
 """
 import json
+import mmap
+import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+try:
+    import ijson  # optional: streams holdings instead of loading whole files
+except ImportError:
+    ijson = None
+
+try:
+    import orjson  # optional: faster full-file parse when ijson is not available
+except ImportError:
+    orjson = None
+
 data_dir = Path(__file__).parent.parent / "data"
-json_files = sorted(data_dir.glob("MiraeAssetLargeAndMidcapFund-*.json"))
-
-print("=" * 70)
-print("Data Verification Report")
-print("=" * 70)
-
-for filepath in json_files:
-    with open(filepath, 'r', encoding='utf-8') as f:
-        data = json.load(f)
-    
-    month = data['month']
-    year = data['year']
-    count = data['holdingsCount']
-    
-    print(f"\n{month} {year}:")
-    print(f"  Total Holdings: {count}")
-    print(f"  Top 5:")
-    for i, h in enumerate(data['holdings'][:5], 1):
-        print(f"    {i}. {h['company']}: {h['percentOfNAV']}%")
-    
-    # Check data quality
-    total_nav = sum(h['percentOfNAV'] for h in data['holdings'])
-    print(f"  Total NAV %: {total_nav:.2f}%")
-
-print("\n" + "=" * 70)
-print(f"Total files: {len(json_files)}")
-print("=" * 70)
+
+# Top-level metadata precedes "holdings" in extracted files, so it sits in the head
+HEADER_SCAN_BYTES = 4096
+HEADER_PATTERNS = {
+    'month': re.compile(rb'"month":\s*"([^"]+)"'),
+    'year': re.compile(rb'"year":\s*(\d+)'),
+    'count': re.compile(rb'"holdingsCount":\s*(\d+)'),
+}
+
+
+def read_header(filepath):
+    """
+    Return {'month', 'year', 'count'} by scanning the head of a mapped file,
+    without reading or parsing the holdings. Falls back to verify_one() if
+    a field is not found there.
+    """
+    header = {}
+    try:
+        with open(filepath, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for key, pattern in HEADER_PATTERNS.items():
+                match = pattern.search(mm, 0, HEADER_SCAN_BYTES)
+                if match is None:
+                    break
+                header[key] = match.group(1)  # copied out before the map closes
+    except ValueError:  # empty file cannot be mapped
+        pass
+    if len(header) < len(HEADER_PATTERNS):
+        summary = verify_one(filepath)
+        return {key: summary[key] for key in HEADER_PATTERNS}
+    return {
+        'month': header['month'].decode('utf-8'),
+        'year': int(header['year']),
+        'count': int(header['count']),
+    }
+
+
+def verify_one(filepath):
+    """
+    Summarise one extracted JSON file as a dict with month, year, count,
+    top5 and total_nav. With ijson the holdings are streamed and only the
+    first five are kept; otherwise the file is loaded with orjson or json.
+    Runs in a worker process, so it only returns data and never prints.
+    """
+    if ijson is None:
+        if orjson is not None:
+            data = orjson.loads(filepath.read_bytes())
+        else:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        total_nav = sum(h['percentOfNAV'] for h in data['holdings'])
+        return {'month': data['month'], 'year': data['year'], 'count': data['holdingsCount'],
+                'top5': data['holdings'][:5], 'total_nav': total_nav}
+
+    meta = {}
+    top = []
+    total_nav = 0
+    holding = None
+    with open(filepath, 'rb') as f:
+        for prefix, event, value in ijson.parse(f, use_float=True):
+            if prefix == 'holdings.item':
+                if event == 'start_map':
+                    holding = {}
+                elif event == 'end_map':
+                    total_nav += holding['percentOfNAV']
+                    if len(top) < 5:
+                        top.append(holding)
+            elif prefix.startswith('holdings.item.'):
+                holding[prefix[len('holdings.item.'):]] = value
+            elif prefix in ('month', 'year', 'holdingsCount'):
+                meta[prefix] = value
+    return {'month': meta['month'], 'year': meta['year'], 'count': meta['holdingsCount'],
+            'top5': top, 'total_nav': total_nav}
+
+
+def main(quick=False):
+    """Print the verification report; quick=True lists month/year/count only."""
+    json_files = sorted(data_dir.glob("MiraeAssetLargeAndMidcapFund-*.json"))
+
+    print("=" * 70)
+    print("Data Verification Report")
+    print("=" * 70)
+
+    if quick:
+        for filepath in json_files:
+            header = read_header(filepath)
+            print(f"  {header['month']} {header['year']}: {header['count']} holdings")
+    else:
+        # Files are independent, so parse them in parallel; map() keeps file order
+        with ProcessPoolExecutor() as pool:
+            results = list(pool.map(verify_one, json_files, chunksize=4))
+
+        for result in results:
+            print(f"\n{result['month']} {result['year']}:")
+            print(f"  Total Holdings: {result['count']}")
+            print(f"  Top 5:")
+            for i, h in enumerate(result['top5'], 1):
+                print(f"    {i}. {h['company']}: {h['percentOfNAV']}%")
+            
+            # Check data quality
+            print(f"  Total NAV %: {result['total_nav']:.2f}%")
+
+    print("\n" + "=" * 70)
+    print(f"Total files: {len(json_files)}")
+    print("=" * 70)
+    return True
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description='Verify extracted fund data')
+    parser.add_argument('--quick', action='store_true',
+                        help='Only list month, year and holdings count (skips parsing holdings)')
+    args = parser.parse_args()
+
+    main(quick=args.quick)
@@ -0,0 +1,59 @@
+import re
+import sys
+import zipfile
+from pathlib import Path
+
+import openpyxl
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import extract_all_funds  # noqa: E402
+
+
+def write_holdings_workbook(path, count=30):
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "EQ"
+    ws.append(["Canara Robeco Large and Mid Cap Fund"])
+    ws.append([None, "Name of the Instrument", "ISIN", "Industry", "Quantity", "% to NAV"])
+    ws.append([None, "Equity & Equity related"])
+    for i in range(count):
+        ws.append([None, f"Company{i} Limited", "INE000000000", "Banks", 100, 0.02])
+    ws.append([None, "Grand Total", None, None, None, 1.0])
+    wb.save(path)
+
+
+def stale_dimension(path):
+    """Rewrite every sheet's <dimension> to A1, as some AMC exports do."""
+    with zipfile.ZipFile(path) as zf:
+        members = {name: zf.read(name) for name in zf.namelist()}
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, data in members.items():
+            if name.startswith("xl/worksheets/"):
+                data = re.sub(rb'<dimension ref="[^"]*"/>', b'<dimension ref="A1"/>', data)
+            zf.writestr(name, data)
+
+
+def test_read_sheet_rows_ignores_stale_dimension(tmp_path):
+    path = tmp_path / "Fund-April-2025.xlsx"
+    write_holdings_workbook(path)
+    stale_dimension(path)
+
+    sheet_names, workbook = extract_all_funds.open_workbook(path)
+    try:
+        rows = extract_all_funds.read_sheet_rows(workbook, sheet_names[0])
+        holdings = extract_all_funds.find_holdings_in_sheet(rows)
+    finally:
+        workbook.close()
+
+    assert len(rows) == 34
+    assert len(holdings) == 30
+
+
+def test_month_year_from_filename_accepts_either_order():
+    parse = extract_all_funds.extract_month_year_from_filename
+    assert parse("Fund-April-2025.xlsx") == ("April", 2025)
+    assert parse("maebf_jan2026.xlsx") == ("January", 2026)
+    assert parse("portfolio_2025_mar.xlsx") == ("March", 2025)
+    assert parse("2025-Sept.xlsx") == ("September", 2025)
+    assert parse("portfolio_2025_marketing.xlsx") == (None, None)
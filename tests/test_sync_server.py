@@ -0,0 +1,63 @@
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import sync_server  # noqa: E402
+from test_extract_all_funds import write_holdings_workbook  # noqa: E402
+
+
+def fake_sync():
+    """Extract and verify one fund under SYNC_TEST_ROOT, as a real sync would."""
+    import extract_all_funds
+    import generate_manifest
+    import verify_data
+
+    root = Path(os.environ["SYNC_TEST_ROOT"])
+    # Absolute folders, since extraction workers may not see a patched ROOT_DIR
+    extract_all_funds.FUNDS = {"mirae": {
+        **extract_all_funds.FUNDS["mirae"],
+        "excel_folder": str(root / "excel-data" / "mirae-asset"),
+        "data_folder": str(root / "data"),
+    }}
+    generate_manifest.generate_manifest = lambda: None  # leave the repo's manifest alone
+    verify_data.data_dir = root / "data"
+
+    if not extract_all_funds.main():
+        sys.exit(1)
+    verify_data.main()
+
+
+def test_sync_worker_runs_extraction_and_verification(tmp_path, monkeypatch):
+    excel_dir = tmp_path / "excel-data" / "mirae-asset"
+    excel_dir.mkdir(parents=True)
+    (tmp_path / "data").mkdir()
+    write_holdings_workbook(excel_dir / "maebf_april2025.xlsx")
+    monkeypatch.setenv("SYNC_TEST_ROOT", str(tmp_path))
+
+    worker = sync_server.SyncWorker(sync_main=fake_sync)
+    job = sync_server.SyncJob()
+    try:
+        worker.run(job)
+    finally:
+        worker.close()
+
+    assert not job.timed_out
+    assert job.returncode == 0, job.output
+    assert (tmp_path / "data" / "MiraeAssetLargeAndMidcapFund-April-2025.json").exists()
+
+
+class UnstartableWorker(sync_server.SyncWorker):
+    def _ensure_process(self):
+        raise RuntimeError("cannot start worker process")
+
+
+def test_worker_loop_survives_a_failed_job():
+    sync_server.start_worker(UnstartableWorker())
+    for _ in range(2):
+        assert sync_server.SYNC_LOCK.acquire(timeout=5)
+        job = sync_server.SyncJob()
+        sync_server.JOB_QUEUE.put(job)
+        assert job.done.wait(timeout=5)
+        assert job.returncode is None